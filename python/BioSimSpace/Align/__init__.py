@@ -34,6 +34,7 @@ Functions
 
     generateNetwork
     matchAtoms
+    matchAtomsBatch
     rmsdAlign
     flexAlign
     merge
@@ -27,16 +27,27 @@ __email__ = "lester.hedges@gmail.com"
 __all__ = [
     "generateNetwork",
     "matchAtoms",
+    "matchAtomsBatch",
     "viewMapping",
     "rmsdAlign",
     "flexAlign",
     "merge",
 ]
 
+import collections as _collections
+import copy as _copy
 import csv as _csv
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+import functools as _functools
+import heapq as _heapq
+import math as _math
+import multiprocessing as _multiprocessing
 import os as _os
 import subprocess as _subprocess
 import sys as _sys
+import threading as _threading
+import numpy as _np
 from typing import Any, Collection, Optional
 from itertools import chain
 
@@ -65,7 +76,6 @@ with _warnings.catch_warnings():
         _RDLogger = _rdkit
 
 from sire.legacy import Base as _SireBase
-from sire.legacy import Maths as _SireMaths
 from sire.legacy import Mol as _SireMol
 from sire.legacy import Units as _SireUnits
 
@@ -95,6 +105,14 @@ else:
 
 from ._merge import merge as _merge
 
+# A cache of previous matchAtoms results. This maps a key of the molecule
+# numbers and versions, along with the matching options, to a value of the
+# result. Entries are stored in order of use, so that the least recently
+# used entry can be removed once the cache is full.
+_match_cache = _collections.OrderedDict()
+_match_cache_size = 256
+_match_cache_lock = _threading.Lock()
+
 try:
     _fkcombu_exe = _SireBase.findExe("fkcombu_bss").absoluteFilePath()
 except:
@@ -725,6 +743,7 @@ def matchAtoms(
     complete_rings_only=True,
     max_scoring_matches=1000,
     roi=None,
+    use_cache=True,
     property_map0={},
     property_map1={},
 ):
@@ -787,6 +806,16 @@ def matchAtoms(
         The region of interest to match.
         Consists of a list of ROI residue indices.
 
+    use_cache : bool
+        Whether to re-use the result of a previous call with the same
+        molecules and options. Molecules are considered the same if they
+        have the same number and haven't been modified since, so the cache
+        is hit when matchAtoms is called repeatedly on unmodified molecules.
+        Any edit, including aligning a molecule with
+        :class:`rmsdAlign <BioSimSpace.Align.rmsdAlign>`, creates a new
+        version, so won't hit the cache. This option is ignored when
+        matching a region of interest.
+
     property_map0 : dict
         A dictionary that maps "properties" in molecule0 to their user
         defined values. This allows the user to refer to properties
@@ -848,8 +877,35 @@ def matchAtoms(
     >>> mapping = BSS.Align.matchAtoms(molecule0, molecule1, roi=[12, 13, 14])
     """
 
+    if not isinstance(use_cache, bool):
+        raise TypeError("'use_cache' must be of type 'bool'")
+
     if roi is None:
-        return _matchAtoms(
+        # Check whether this match has previously been computed.
+        if use_cache:
+            key = _get_match_cache_key(
+                molecule0,
+                molecule1,
+                scoring_function,
+                matches,
+                return_scores,
+                prematch,
+                timeout,
+                complete_rings_only,
+                max_scoring_matches,
+                property_map0,
+                property_map1,
+            )
+            with _match_cache_lock:
+                cached = _match_cache.get(key)
+                if cached is not None:
+                    _match_cache.move_to_end(key)
+            if cached is not None:
+                return _copy.deepcopy(cached)
+        else:
+            key = None
+
+        result = _matchAtoms(
             molecule0=molecule0,
             molecule1=molecule1,
             scoring_function=scoring_function,
@@ -862,6 +918,16 @@ def matchAtoms(
             property_map0=property_map0,
             property_map1=property_map1,
         )
+
+        # Update the cache, removing the least recently used entry if full.
+        if key is not None:
+            cached = _copy.deepcopy(result)
+            with _match_cache_lock:
+                _match_cache[key] = cached
+                if len(_match_cache) > _match_cache_size:
+                    _match_cache.popitem(last=False)
+
+        return result
     else:
         return _roiMatch(
             molecule0=molecule0,
@@ -872,6 +938,115 @@ def matchAtoms(
         )
 
 
+def matchAtomsBatch(pairs, n_workers=None, **kwargs):
+    """
+    Find mappings between atom indices for a collection of molecule pairs.
+    The pairs are matched in parallel using a pool of worker processes, each
+    of which calls :class:`matchAtoms <BioSimSpace.Align.matchAtoms>`. This
+    is useful when matching many ligands, e.g. when building a perturbation
+    network for a library of compounds.
+
+    Note that the worker processes are started using the "spawn" method, so
+    scripts calling this function should protect their entry point with an
+    ``if __name__ == "__main__":`` guard.
+
+    Parameters
+    ----------
+
+    pairs : [(:class:`Molecule <BioSimSpace._SireWrappers.Molecule>`, :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`)]
+        A list of (molecule0, molecule1) tuples to match.
+
+    n_workers : int
+        The number of worker processes to use. If None, then the number
+        of available CPUs is used.
+
+    kwargs : dict
+        Additional keyword arguments that are passed to
+        :class:`matchAtoms <BioSimSpace.Align.matchAtoms>` for each pair.
+
+    Returns
+    -------
+
+    results : list
+        A list containing the result of
+        :class:`matchAtoms <BioSimSpace.Align.matchAtoms>` for each pair,
+        in the same order as the input.
+
+    Examples
+    --------
+
+    Find the best mapping between a reference ligand and each molecule
+    in a library.
+
+    >>> import BioSimSpace as BSS
+    >>> pairs = [(molecule, reference) for molecule in library]
+    >>> mappings = BSS.Align.matchAtomsBatch(pairs)
+
+    Find the 5 best mappings for each pair using 4 worker processes.
+
+    >>> import BioSimSpace as BSS
+    >>> mappings = BSS.Align.matchAtomsBatch(pairs, n_workers=4, matches=5)
+    """
+
+    # Validate the input.
+
+    if not isinstance(pairs, (list, tuple)):
+        raise TypeError("'pairs' must be a list of (Molecule, Molecule) tuples.")
+
+    for pair in pairs:
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+            raise TypeError("'pairs' must be a list of (Molecule, Molecule) tuples.")
+        _validate_molecule_args(pair[0], pair[1], {}, {})
+
+    if n_workers is not None:
+        if type(n_workers) is not int:
+            raise TypeError("'n_workers' must be of type 'int'")
+        if n_workers < 1:
+            raise ValueError("'n_workers' must be >= 1")
+    else:
+        n_workers = _os.cpu_count() or 1
+
+    n_workers = min(n_workers, len(pairs))
+
+    # Not worth starting a pool of processes, match in serial.
+    if n_workers <= 1:
+        return [_match_pair_worker(pair, kwargs) for pair in pairs]
+
+    # Sire and RDKit objects are pickled when sent to the workers. Use the
+    # "spawn" method to avoid forking a process whose native libraries may
+    # hold running threads.
+    worker = _functools.partial(_match_pair_worker, kwargs=kwargs)
+    with _ProcessPoolExecutor(
+        max_workers=n_workers, mp_context=_multiprocessing.get_context("spawn")
+    ) as executor:
+        chunksize = max(1, min(8, len(pairs) // n_workers))
+        return list(executor.map(worker, pairs, chunksize=chunksize))
+
+
+def _match_pair_worker(pair, kwargs):
+    """
+    Internal helper function to match a single pair of molecules. This is
+    defined at module level so that it can be pickled and sent to worker
+    processes.
+
+    Parameters
+    ----------
+
+    pair : (:class:`Molecule <BioSimSpace._SireWrappers.Molecule>`, :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`)
+        The pair of molecules to match.
+
+    kwargs : dict
+        Keyword arguments passed to :class:`matchAtoms <BioSimSpace.Align.matchAtoms>`.
+
+    Returns
+    -------
+
+    result : dict, [dict], ([dict], list)
+        The result of :class:`matchAtoms <BioSimSpace.Align.matchAtoms>`.
+    """
+    return matchAtoms(pair[0], pair[1], **kwargs)
+
+
 def _matchAtoms(
     molecule0,
     molecule1,
@@ -890,15 +1065,7 @@ def _matchAtoms(
 
     # Validate input.
 
-    if not isinstance(molecule0, _Molecule):
-        raise TypeError(
-            "'molecule0' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(molecule1, _Molecule):
-        raise TypeError(
-            "'molecule1' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
+    _validate_molecule_args(molecule0, molecule1, property_map0, property_map1)
 
     if not isinstance(scoring_function, str):
         raise TypeError("'scoring_function' must be of type 'str'")
@@ -941,12 +1108,6 @@ def _matchAtoms(
     if max_scoring_matches <= 0:
         raise ValueError("'max_scoring_matches' must be >= 1.")
 
-    if not isinstance(property_map0, dict):
-        raise TypeError("'property_map0' must be of type 'dict'")
-
-    if not isinstance(property_map1, dict):
-        raise TypeError("'property_map1' must be of type 'dict'")
-
     # Extract the Sire molecule from each BioSimSpace molecule.
     mol0 = molecule0._getSireObject()
     mol1 = molecule1._getSireObject()
@@ -954,120 +1115,130 @@ def _matchAtoms(
     # Convert the timeout to seconds and take the value as an integer.
     timeout = int(timeout.seconds().value())
 
-    # Use RDKkit to find the maximum common substructure.
-
-    try:
-        # Convert the molecules to RDKit format.
-        mols = [
-            _Convert.toRDKit(mol0, property_map=property_map0),
-            _Convert.toRDKit(mol1, property_map=property_map1),
-        ]
-
-        # Generate the MCS match.
-        mcs = _rdFMCS.FindMCS(
-            mols,
-            atomCompare=_rdFMCS.AtomCompare.CompareAny,
-            bondCompare=_rdFMCS.BondCompare.CompareAny,
-            completeRingsOnly=complete_rings_only,
-            ringMatchesRingOnly=True,
-            matchChiralTag=False,
-            matchValences=False,
-            maximizeBonds=False,
-            timeout=timeout,
+    # The prematch already maps every atom in the smaller molecule, so it is
+    # the only possible match. Skip the MCS searches and just score it.
+    if len(prematch) > 0 and len(prematch) == min(mol0.nAtoms(), mol1.nAtoms()):
+        mappings, scores = _score_sire_mappings(
+            mol0,
+            mol1,
+            [_to_sire_mapping(prematch)],
+            prematch,
+            _scoring_function,
+            property_map0,
+            property_map1,
         )
 
-        # Get the common substructure as a SMARTS string.
-        mcs_smarts = _Chem.MolFromSmarts(mcs.smartsString)
-
-    except:
-        raise RuntimeError("RDKit MCS mapping failed!")
-
-    # Score the mappings and return them in sorted order (best to worst).
-    mappings, scores = _score_rdkit_mappings(
-        mol0,
-        mol1,
-        mols[0],
-        mols[1],
-        mcs_smarts,
-        prematch,
-        _scoring_function,
-        max_scoring_matches,
-        property_map0,
-        property_map1,
-    )
+    else:
+        # Use RDKkit to find the maximum common substructure.
 
-    # Sometimes RDKit fails to generate a mapping that includes the prematch.
-    # If so, then try generating a mapping using the MCS routine from Sire.
-    if len(mappings) == 1 and mappings[0] == prematch:
-        # Warn that we've fallen back on using Sire.
-        if prematch != {}:
-            _warnings.warn("RDKit mapping didn't include prematch. Using Sire MCS.")
-
-        # Sire MCS isn't currently supported on Windows.
-        if _sys.platform == "win32":
-            _warnings.warn("Sire MCS is currently unsupported on Windows.")
-            if return_scores:
-                return {}, []
-            else:
-                return {}
+        try:
+            # Convert the molecules to RDKit format.
+            mols = [
+                _Convert.toRDKit(mol0, property_map=property_map0),
+                _Convert.toRDKit(mol1, property_map=property_map1),
+            ]
 
-        # Warn about unsupported options.
-        if not complete_rings_only:
-            _warnings.warn(
-                "Using Sire MCS. Ignoring unsupported 'complete_rings_only' option!"
+            # Generate the MCS match.
+            mcs = _rdFMCS.FindMCS(
+                mols,
+                atomCompare=_rdFMCS.AtomCompare.CompareAny,
+                bondCompare=_rdFMCS.BondCompare.CompareAny,
+                completeRingsOnly=complete_rings_only,
+                ringMatchesRingOnly=True,
+                matchChiralTag=False,
+                matchValences=False,
+                maximizeBonds=False,
+                timeout=timeout,
             )
 
-        # Convert timeout to a Sire Unit.
-        timeout = timeout * _SireUnits.second
+            # Get the common substructure as a SMARTS string. This is parsed
+            # from the string, rather than using mcs.queryMol, since the order
+            # in which matches are enumerated depends on the query molecule,
+            # which determines the subset that is scored when the number of
+            # matches is truncated at max_scoring_matches.
+            mcs_smarts = _Chem.MolFromSmarts(mcs.smartsString)
 
-        # Regular match. Include light atoms, but don't allow matches between heavy
-        # and light atoms.
-        m0 = mol0.evaluate().findMCSmatches(
-            mol1,
-            _SireMol.AtomResultMatcher(_to_sire_mapping(prematch)),
-            timeout,
-            True,
-            property_map0,
-            property_map1,
-            6,
-            False,
-        )
+        except:
+            raise RuntimeError("RDKit MCS mapping failed!")
 
-        # Include light atoms, and allow matches between heavy and light atoms.
-        # This captures mappings such as O --> H in methane to methanol.
-        m1 = mol0.evaluate().findMCSmatches(
+        # Score the mappings.
+        mappings, scores = _score_rdkit_mappings(
+            mol0,
             mol1,
-            _SireMol.AtomResultMatcher(_to_sire_mapping(prematch)),
-            timeout,
-            True,
+            mols[0],
+            mols[1],
+            mcs_smarts,
+            prematch,
+            _scoring_function,
+            max_scoring_matches,
             property_map0,
             property_map1,
-            0,
-            False,
         )
 
-        # Take the mapping with the larger number of matches.
-        if len(m1) > 0:
-            if len(m0) > 0:
-                if len(m1[0]) > len(m0[0]):
-                    mappings = m1
+        # Sometimes RDKit fails to generate a mapping that includes the prematch.
+        # If so, then try generating a mapping using the MCS routine from Sire.
+        if len(mappings) == 0 or (
+            len(mappings) == 1 and _arrays_to_mapping(*mappings[0]) == prematch
+        ):
+            # Warn that we've fallen back on using Sire.
+            if prematch != {}:
+                _warnings.warn("RDKit mapping didn't include prematch. Using Sire MCS.")
+
+            # Sire MCS isn't currently supported on Windows.
+            if _sys.platform == "win32":
+                _warnings.warn("Sire MCS is currently unsupported on Windows.")
+                if return_scores:
+                    return {}, []
+                else:
+                    return {}
+
+            # Warn about unsupported options.
+            if not complete_rings_only:
+                _warnings.warn(
+                    "Using Sire MCS. Ignoring unsupported 'complete_rings_only' option!"
+                )
+
+            # Convert timeout to a Sire Unit.
+            timeout = timeout * _SireUnits.second
+
+            # Perform the two Sire MCS searches.
+            m0, m1 = _find_sire_mcs_matches(
+                mol0, mol1, prematch, timeout, property_map0, property_map1
+            )
+
+            # Take the mapping with the larger number of matches.
+            if len(m1) > 0:
+                if len(m0) > 0:
+                    if len(m1[0]) > len(m0[0]):
+                        mappings = m1
+                    else:
+                        mappings = m0
                 else:
-                    mappings = m0
+                    mappings = m1
             else:
-                mappings = m1
-        else:
-            mappings = m0
+                mappings = m0
+
+            # Score the mappings.
+            mappings, scores = _score_sire_mappings(
+                mol0,
+                mol1,
+                mappings,
+                prematch,
+                _scoring_function,
+                property_map0,
+                property_map1,
+            )
 
-        # Score the mappings and return them in sorted order (best to worst).
-        mappings, scores = _score_sire_mappings(
-            mol0,
-            mol1,
-            mappings,
-            prematch,
-            _scoring_function,
-            property_map0,
-            property_map1,
-        )
+    # Sort the mappings from best to worst, keeping the requested number.
+    mappings, scores = _rank_mappings(mappings, scores, matches)
+
+    # No mappings were found.
+    if len(mappings) == 0:
+        mappings = [prematch]
+
+    # Only convert the scores to RMSD values if they are returned.
+    if return_scores:
+        scores = _to_rmsd_scores(scores)
 
     if matches == 1:
         if return_scores:
@@ -1511,21 +1682,7 @@ def rmsdAlign(
 
 
 def _rmsdAlign(molecule0, molecule1, mapping=None, property_map0={}, property_map1={}):
-    if not isinstance(molecule0, _Molecule):
-        raise TypeError(
-            "'molecule0' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(molecule1, _Molecule):
-        raise TypeError(
-            "'molecule1' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(property_map0, dict):
-        raise TypeError("'property_map0' must be of type 'dict'")
-
-    if not isinstance(property_map1, dict):
-        raise TypeError("'property_map1' must be of type 'dict'")
+    _validate_molecule_args(molecule0, molecule1, property_map0, property_map1)
 
     # The user has passed an atom mapping.
     if mapping is not None:
@@ -1704,21 +1861,7 @@ def _flexAlign(
         if not _os.path.isfile(fkcombu_exe):
             raise IOError("'fkcombu' executable doesn't exist: '%s'" % fkcombu_exe)
 
-    if not isinstance(molecule0, _Molecule):
-        raise TypeError(
-            "'molecule0' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(molecule1, _Molecule):
-        raise TypeError(
-            "'molecule1' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(property_map0, dict):
-        raise TypeError("'property_map0' must be of type 'dict'")
-
-    if not isinstance(property_map1, dict):
-        raise TypeError("'property_map1' must be of type 'dict'")
+    _validate_molecule_args(molecule0, molecule1, property_map0, property_map1)
 
     # The user has passed an atom mapping.
     if mapping is not None:
@@ -2004,21 +2147,7 @@ def merge(
     >>> molecule0 = BSS.Align.merge(molecule0, molecule1)
     """
 
-    if not isinstance(molecule0, _Molecule):
-        raise TypeError(
-            "'molecule0' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(molecule1, _Molecule):
-        raise TypeError(
-            "'molecule1' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(property_map0, dict):
-        raise TypeError("'property_map0' must be of type 'dict'")
-
-    if not isinstance(property_map1, dict):
-        raise TypeError("'property_map1' must be of type 'dict'")
+    _validate_molecule_args(molecule0, molecule1, property_map0, property_map1)
 
     if not isinstance(allow_ring_breaking, bool):
         raise TypeError("'allow_ring_breaking' must be of type 'bool'")
@@ -2123,25 +2252,11 @@ def viewMapping(
 
     _assert_imported(_rdkit)
 
-    if not isinstance(molecule0, _Molecule):
-        raise TypeError(
-            "'molecule0' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
-
-    if not isinstance(molecule1, _Molecule):
-        raise TypeError(
-            "'molecule1' must be of type 'BioSimSpace._SireWrappers.Molecule'"
-        )
+    _validate_molecule_args(molecule0, molecule1, property_map0, property_map1)
 
     if roi is not None and not isinstance(roi, int):
         raise TypeError("'roi' must be of type 'int'")
 
-    if not isinstance(property_map0, dict):
-        raise TypeError("'property_map0' must be of type 'dict'")
-
-    if not isinstance(property_map1, dict):
-        raise TypeError("'property_map1' must be of type 'dict'")
-
     if isinstance(pixels, float):
         pixels = int(pixels)
     if not type(pixels) is int:
@@ -2458,9 +2573,10 @@ def _score_rdkit_mappings(
     Internal function to score atom mappings based on the root mean squared
     displacement (RMSD) between mapped atoms in two molecules. Optionally,
     molecule0 can first be aligned to molecule1 based on the mapping prior
-    to computing the RMSD. The function returns the mappings sorted based
-    on their score from best to worst, along with a list containing the
-    scores for each mapping.
+    to computing the RMSD. The function returns the mappings, along with a
+    list containing the mean squared displacement for each mapping in
+    Angstrom squared. Use _rank_mappings to sort the mappings from best to
+    worst and _to_rmsd_scores to convert the scores to RMSD values.
 
     Parameters
     ----------
@@ -2504,8 +2620,9 @@ def _score_rdkit_mappings(
     Returns
     -------
 
-    mapping, scores : ([dict], list)
-        The ranked mappings and corresponding scores.
+    mapping, scores : ([(numpy.ndarray, numpy.ndarray)], [float])
+        The mappings, stored as arrays of matching atom indices in the two
+        molecules, and corresponding scores.
     """
 
     # Adapted from FESetup: https://github.com/CCPBioSim/fesetup
@@ -2547,145 +2664,67 @@ def _score_rdkit_mappings(
     else:
         is_swapped = False
 
+    # Store the matches as arrays of atom indices.
+    matches0 = _np.array(matches0, dtype=_np.int32)
+    matches1 = _np.array(matches1, dtype=_np.int32)
+
+    # Extract the coordinates of both molecules.
+    coordinates0 = _get_coordinates(molecule0)
+    coordinates1 = _get_coordinates(molecule1)
+
+    # Get the function used to score each mapping.
+    scorer = _get_mapping_scorer(
+        molecule0,
+        molecule1,
+        coordinates0,
+        coordinates1,
+        scoring_function,
+        property_map0,
+        property_map1,
+    )
+
+    # Convert the prematch to arrays of atom indices.
+    prematch0, prematch1 = _mapping_to_arrays(prematch)
+
     # Initialise a list to hold the mappings.
     mappings = []
 
     # Initialise a list of to hold the score for each mapping.
     scores = []
 
-    # Whether there was a GSL alignment error.
-    is_gsl_error = False
+    # Initialise a set to hold the mappings that have already been seen.
+    seen = set()
 
     # Loop over all matches from mol0.
-    for x in range(len(matches0)):
-        match0 = matches0[x]
-
+    for match0 in matches0:
         # Loop over all matches from mol1.
-        for y in range(len(matches1)):
-            match1 = matches1[y]
-
-            # Initialise the mapping for this match.
-            mapping = {}
-
-            # Loop over all atoms in the match.
-            for i, idx0 in enumerate(match0):
-                idx1 = match1[i]
-
-                # Add to the mapping.
-                if is_swapped:
-                    mapping[idx1] = idx0
-                else:
-                    mapping[idx0] = idx1
-
-            mapping = dict(sorted(mapping.items()))
-            sire_mapping = {
-                _SireMol.AtomIdx(idx0): _SireMol.AtomIdx(idx1)
-                for idx0, idx1 in mapping.items()
-            }
-
-            # This is a new mapping:
-            if not mapping in mappings:
-                # Check that the mapping contains the pre-match.
-                is_valid = True
-                for idx0, idx1 in prematch.items():
-                    # Pre-match isn't found, return to top of loop.
-                    if idx0 not in mapping or mapping[idx0] != idx1:
-                        is_valid = False
-                        break
-
-                if is_valid:
-                    # If there is only a single atom in the mapping and one molecule
-                    # has one atom, e.g. an ion, then skip the alignment.
-                    if len(mapping) == 1:
-                        mappings.append(mapping)
-                        scores.append(0.0)
-                    else:
-                        # Rigidly align molecule0 to molecule1 based on the mapping.
-                        if scoring_function == "RMSDALIGN":
-                            try:
-                                molecule0 = (
-                                    molecule0.move()
-                                    .align(
-                                        molecule1,
-                                        _SireMol.AtomResultMatcher(sire_mapping),
-                                    )
-                                    .molecule()
-                                )
-                            except Exception as e:
-                                if (
-                                    "Could not calculate the single value decomposition"
-                                    in str(e)
-                                ):
-                                    is_gsl_error = True
-                                    gsl_exception = e
-                                else:
-                                    msg = (
-                                        "Failed to align molecules when scoring based on mapping: %r"
-                                        % mapping
-                                    )
-                                    if _isVerbose():
-                                        raise _AlignmentError(msg) from e
-                                    else:
-                                        raise _AlignmentError(msg) from None
-                        # Flexibly align molecule0 to molecule1 based on the mapping.
-                        elif scoring_function == "RMSDFLEXALIGN":
-                            molecule0 = flexAlign(
-                                _Molecule(molecule0),
-                                _Molecule(molecule1),
-                                mapping,
-                                property_map0=property_map0,
-                                property_map1=property_map1,
-                            )._sire_object
-
-                        # Append the mapping to the list.
-                        mappings.append(mapping)
-
-                        # We now compute the RMSD between the coordinates of the matched atoms
-                        # in molecule0 and molecule1.
-
-                        # Initialise lists to hold the coordinates.
-                        c0 = []
-                        c1 = []
-
-                        # Loop over each atom index in the map.
-                        for idx0, idx1 in sire_mapping.items():
-                            # Append the coordinates of the matched atom in molecule0.
-                            c0.append(molecule0.atom(idx0).property("coordinates"))
-                            # Append the coordinates of atom in molecule1 to which it maps.
-                            c1.append(molecule1.atom(idx1).property("coordinates"))
-
-                        # Compute the RMSD between the two sets of coordinates.
-                        scores.append(_SireMaths.getRMSD(c0, c1))
-
-    # No mappings were found.
-    if len(mappings) == 0:
-        # We failed to align mappings during scoring due to convergence issues
-        # during the GSL single value decomposition routine.
-        if is_gsl_error:
-            msg = (
-                "Failed to align molecules when scoring. "
-                "Try minimising your molecular coordinates prior calling matchAtoms."
-            )
-            if _isVerbose():
-                raise _AlignmentError(msg) from gsl_exception
+        for match1 in matches1:
+            # Create the mapping for this match, sorted by the atom indices
+            # in molecule0.
+            if is_swapped:
+                idx0, idx1 = match1, match0
             else:
-                raise _AlignmentError(msg) from None
-
-        if len(prematch) == 0:
-            return ([{}], [])
-        else:
-            return ([prematch], [])
+                idx0, idx1 = match0, match1
+            order = _np.argsort(idx0, kind="stable")
+            idx0 = idx0[order]
+            idx1 = idx1[order]
 
-    # Sort the scores and return the sorted keys. (Smaller RMSD is best)
-    keys = sorted(range(len(scores)), key=lambda k: scores[k])
+            # This is a new mapping:
+            key = (idx0.tobytes(), idx1.tobytes())
+            if not key in seen:
+                seen.add(key)
 
-    # Sort the mappings.
-    mappings = [mappings[x] for x in keys]
+                # Check that the mapping contains the pre-match.
+                if _contains_prematch(idx0, idx1, prematch0, prematch1):
+                    # Append the mapping to the list.
+                    mappings.append((idx0, idx1))
 
-    # Sort the scores and convert to Angstroms.
-    scores = [scores[x] * _Units.Length.angstrom for x in keys]
+                    # Score the mapping. If there is only a single atom in the
+                    # mapping and one molecule has one atom, e.g. an ion, then
+                    # skip the alignment.
+                    scores.append(0.0 if len(idx0) == 1 else scorer(idx0, idx1))
 
-    # Return the sorted mappings and their scores.
+    # Return the mappings and their scores.
     return (mappings, scores)
 
 
@@ -2702,9 +2741,10 @@ def _score_sire_mappings(
     Internal function to score atom mappings based on the root mean squared
     displacement (RMSD) between mapped atoms in two molecules. Optionally,
     molecule0 can first be aligned to molecule1 based on the mapping prior
-    to computing the RMSD. The function returns the mappings sorted based
-    on their score from best to worst, along with a list containing the
-    scores for each mapping.
+    to computing the RMSD. The function returns the mappings, along with a
+    list containing the mean squared displacement for each mapping in
+    Angstrom squared. Use _rank_mappings to sort the mappings from best to
+    worst and _to_rmsd_scores to convert the scores to RMSD values.
 
     Parameters
     ----------
@@ -2736,8 +2776,9 @@ def _score_sire_mappings(
     Returns
     -------
 
-    mapping, scores : ([dict], list)
-        The ranked mappings and corresponding scores.
+    mapping, scores : ([(numpy.ndarray, numpy.ndarray)], [float])
+        The mappings, stored as arrays of matching atom indices in the two
+        molecules, and corresponding scores.
     """
 
     # Make sure to re-map the coordinates property in both molecules, otherwise
@@ -2758,113 +2799,650 @@ def _score_sire_mappings(
             .commit()
         )
 
+    # Extract the coordinates of both molecules.
+    coordinates0 = _get_coordinates(molecule0)
+    coordinates1 = _get_coordinates(molecule1)
+
+    # Get the function used to score each mapping.
+    scorer = _get_mapping_scorer(
+        molecule0,
+        molecule1,
+        coordinates0,
+        coordinates1,
+        scoring_function,
+        property_map0,
+        property_map1,
+    )
+
     # Initialise a list to hold the mappings.
     mappings = []
 
     # Initialise a list of to hold the score for each mapping.
     scores = []
 
+    # Convert the prematch to AtomIdx key:value pairs once, rather than for
+    # each mapping.
+    sire_prematch = _to_sire_mapping(prematch)
+
     # Loop over all of the mappings.
     for mapping in sire_mappings:
         # Check that the mapping contains the pre-match.
         is_valid = True
-        for idx0, idx1 in prematch.items():
+        for idx0, idx1 in sire_prematch.items():
             # Pre-match isn't found, return to top of loop.
-            if _SireMol.AtomIdx(idx0) not in mapping or mapping[
-                _SireMol.AtomIdx(idx0)
-            ] != _SireMol.AtomIdx(idx1):
+            if idx0 not in mapping or mapping[idx0] != idx1:
                 is_valid = False
                 break
 
         if is_valid:
-            # If there is only a single atom in the mapping and one molecule
-            # has one atom, e.g. an ion, then skip the alignment.
-            if len(mapping) == 1:
-                mappings.append(mapping)
-                scores.append(0.0)
-            else:
-                # Rigidly align molecule0 to molecule1 based on the mapping.
-                if scoring_function == "RMSDALIGN":
-                    try:
-                        molecule0 = (
-                            molecule0.move()
-                            .align(molecule1, _SireMol.AtomResultMatcher(mapping))
-                            .molecule()
-                        )
-                    except Exception as e:
-                        msg = (
-                            "Failed to align molecules when scoring based on mapping: %r"
-                            % mapping
-                        )
-                        if _isVerbose():
-                            raise _AlignmentError(msg) from e
-                        else:
-                            raise _AlignmentError(msg) from None
-                # Flexibly align molecule0 to molecule1 based on the mapping.
-                elif scoring_function == "RMSDFLEXALIGN":
-                    molecule0 = flexAlign(
-                        _Molecule(molecule0),
-                        _Molecule(molecule1),
-                        _from_sire_mapping(mapping),
-                        property_map0=property_map0,
-                        property_map1=property_map1,
-                    )._sire_object
-
-                # Append the mapping to the list.
-                mapping = _from_sire_mapping(mapping)
-                mapping = dict(sorted(mapping.items()))
-                mappings.append(mapping)
-
-                # We now compute the RMSD between the coordinates of the matched atoms
-                # in molecule0 and molecule1.
-
-                # Initialise lists to hold the coordinates.
-                c0 = []
-                c1 = []
-
-                # Loop over each atom index in the map.
-                for idx0, idx1 in mapping.items():
-                    # Append the coordinates of the matched atom in molecule0.
-                    c0.append(molecule0.atom(idx0).property("coordinates"))
-                    # Append the coordinates of atom in molecule1 to which it maps.
-                    c1.append(molecule1.atom(idx1).property("coordinates"))
-
-                # Compute the RMSD between the two sets of coordinates.
-                scores.append(_SireMaths.getRMSD(c0, c1))
-
-    # No mappings were found.
-    if len(mappings) == 0:
-        if len(prematch) == 0:
-            return ([{}], [])
-        else:
-            return ([prematch], [])
+            # Convert the mapping to arrays of atom indices.
+            idx0, idx1 = _mapping_to_arrays(mapping)
 
-    # Sort the scores and return the sorted keys. (Smaller RMSD is best)
-    keys = sorted(range(len(scores)), key=lambda k: scores[k])
+            # Append the mapping to the list.
+            mappings.append((idx0, idx1))
 
-    # Sort the mappings.
-    mappings = [mappings[x] for x in keys]
+            # Score the mapping. If there is only a single atom in the mapping
+            # and one molecule has one atom, e.g. an ion, then skip the
+            # alignment.
+            scores.append(0.0 if len(idx0) == 1 else scorer(idx0, idx1))
 
-    # Sort the scores and convert to Angstroms.
-    scores = [scores[x] * _Units.Length.angstrom for x in keys]
-
-    # Return the sorted mappings and their scores.
+    # Return the mappings and their scores.
     return (mappings, scores)
 
 
-def _validate_mapping(molecule0, molecule1, mapping, name):
+def _get_match_cache_key(
+    molecule0,
+    molecule1,
+    scoring_function,
+    matches,
+    return_scores,
+    prematch,
+    timeout,
+    complete_rings_only,
+    max_scoring_matches,
+    property_map0,
+    property_map1,
+):
     """
-    Internal function to validate that a mapping contains key:value pairs
-    of the correct type.
+    Internal function to generate the key for the matchAtoms cache. The
+    molecules are identified by their number and version, the latter of
+    which changes whenever a molecule is edited. See matchAtoms for a
+    description of the other parameters.
 
-    Parameters
-    ----------
+    Returns
+    -------
 
-    molecule0 : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`
-        The molecule of interest.
+    key : tuple
+        The cache key. This is None if a key can't be generated, e.g. if
+        the arguments are invalid, in which case the result isn't cached.
+    """
 
-    molecule1 : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`
-        The reference molecule.
+    if not isinstance(molecule0, _Molecule) or not isinstance(molecule1, _Molecule):
+        return None
+
+    if not isinstance(timeout, _Units.Time._Time):
+        return None
+
+    try:
+        key = (
+            molecule0._sire_object.number().value(),
+            molecule0._sire_object.version(),
+            molecule1._sire_object.number().value(),
+            molecule1._sire_object.version(),
+            scoring_function,
+            matches,
+            return_scores,
+            frozenset(prematch.items()),
+            timeout.seconds().value(),
+            complete_rings_only,
+            max_scoring_matches,
+            frozenset(property_map0.items()),
+            frozenset(property_map1.items()),
+        )
+        hash(key)
+    except:
+        return None
+
+    return key
+
+
+def _rank_mappings(mappings, scores, matches):
+    """
+    Internal function to rank mappings based on their root mean squared
+    displacement (RMSD) score, from best to worst. Only the requested number
+    of matches are ranked and returned. Ranking is performed using the mean
+    squared displacement, which is returned for the kept mappings. Use
+    _to_rmsd_scores to convert these to RMSD values.
+
+    Parameters
+    ----------
+
+    mappings : [(numpy.ndarray, numpy.ndarray)]
+        The list of mappings, stored as arrays of matching atom indices in
+        the two molecules.
+
+    scores : [float]
+        The mean squared displacement for each mapping in Angstrom squared.
+
+    matches : int
+        The maximum number of matches to return.
+
+    Returns
+    -------
+
+    mapping, scores : ([dict], [float])
+        The ranked mappings and corresponding scores.
+    """
+
+    # There are no scores to rank by.
+    if len(scores) == 0:
+        return ([], [])
+
+    num_scores = len(scores)
+
+    # Find the keys of the best scores. (Smaller RMSD is best.) Avoid a full
+    # sort when only a small number of matches are required.
+    if matches == 1:
+        keys = [min(range(num_scores), key=scores.__getitem__)]
+    elif 1 < matches < num_scores // 4:
+        keys = _heapq.nsmallest(matches, range(num_scores), key=scores.__getitem__)
+    else:
+        keys = _np.argsort(scores, kind="stable")[:matches]
+
+    # Sort the mappings, converting them to dictionaries.
+    mappings = [_arrays_to_mapping(*mappings[x]) for x in keys]
+
+    # Sort the scores.
+    scores = [scores[x] for x in keys]
+
+    # Return the sorted mappings and their scores.
+    return (mappings, scores)
+
+
+def _to_rmsd_scores(scores):
+    """
+    Internal function to convert mean squared displacement scores to root
+    mean squared displacement (RMSD) values in Angstrom.
+
+    Parameters
+    ----------
+
+    scores : [float]
+        The mean squared displacement scores in Angstrom squared.
+
+    Returns
+    -------
+
+    scores : [:class:`Length <BioSimSpace.Types.Length>`]
+        The RMSD scores.
+    """
+
+    return [_math.sqrt(score) * _Units.Length.angstrom for score in scores]
+
+
+def _get_coordinates(molecule):
+    """
+    Internal function to extract the coordinates of all atoms in a molecule.
+
+    Parameters
+    ----------
+
+    molecule : Sire.Mol.Molecule
+        The molecule (Sire representation).
+
+    Returns
+    -------
+
+    coordinates : numpy.ndarray
+        An array of shape (num_atoms, 3) containing the atomic coordinates.
+    """
+
+    # Extract the coordinates of all atoms in a single call, rather than
+    # querying each atom in turn.
+    coordinates = molecule.property("coordinates").toVector()
+
+    return _np.array([[c.x(), c.y(), c.z()] for c in coordinates], dtype=float)
+
+
+def _compute_msd(coordinates0, coordinates1, idx0, idx1):
+    """
+    Internal function to compute the mean squared displacement (MSD) between
+    the coordinates of mapped atoms in two molecules. This is the square of
+    the root mean squared displacement (RMSD).
+
+    Parameters
+    ----------
+
+    coordinates0 : numpy.ndarray
+        The coordinates of the atoms in the first molecule.
+
+    coordinates1 : numpy.ndarray
+        The coordinates of the atoms in the second molecule.
+
+    idx0 : numpy.ndarray
+        The indices of the mapped atoms in the first molecule.
+
+    idx1 : numpy.ndarray
+        The indices of the atoms in the second molecule that they map to.
+
+    Returns
+    -------
+
+    msd : float
+        The MSD between the mapped atoms.
+    """
+
+    delta = coordinates0[idx0] - coordinates1[idx1]
+
+    return float((delta * delta).sum(axis=1).mean())
+
+
+def _compute_aligned_msd(coordinates0, coordinates1, idx0, idx1):
+    """
+    Internal function to compute the mean squared displacement (MSD) between
+    the coordinates of mapped atoms in two molecules following an optimal
+    rigid-body superposition of the mapped atoms in the first molecule onto
+    those in the second. This uses the quaternion characteristic polynomial
+    (QCP) formulation of Theobald, Acta Cryst. A61, 478-480 (2005), which
+    avoids the need to explicitly compute the rotation.
+
+    Parameters
+    ----------
+
+    coordinates0 : numpy.ndarray
+        The coordinates of the atoms in the first molecule.
+
+    coordinates1 : numpy.ndarray
+        The coordinates of the atoms in the second molecule.
+
+    idx0 : numpy.ndarray
+        The indices of the mapped atoms in the first molecule.
+
+    idx1 : numpy.ndarray
+        The indices of the atoms in the second molecule that they map to.
+
+    Returns
+    -------
+
+    msd : float
+        The MSD between the mapped atoms after alignment.
+    """
+
+    # Centre the mapped coordinates.
+    c0 = coordinates0[idx0]
+    c1 = coordinates1[idx1]
+    c0 = c0 - c0.mean(axis=0)
+    c1 = c1 - c1.mean(axis=0)
+
+    # Half the sum of the inner products of each set of coordinates.
+    e0 = 0.5 * ((c0 * c0).sum() + (c1 * c1).sum())
+
+    # The correlation matrix.
+    (sxx, sxy, sxz), (syx, syy, syz), (szx, szy, szz) = c0.T @ c1
+
+    # The symmetric key matrix.
+    key = _np.array(
+        [
+            [sxx + syy + szz, syz - szy, szx - sxz, sxy - syx],
+            [syz - szy, sxx - syy - szz, sxy + syx, szx + sxz],
+            [szx - sxz, sxy + syx, -sxx + syy - szz, syz + szy],
+            [sxy - syx, szx + sxz, syz + szy, -sxx - syy + szz],
+        ]
+    )
+
+    # The optimal MSD follows from the largest eigenvalue of the key matrix.
+    # This is found via a direct symmetric eigendecomposition, which is robust
+    # to the degenerate eigenvalues that arise for collinear coordinates, where
+    # Newton-Raphson iteration on the characteristic polynomial can fail.
+    eigenvalue = _np.linalg.eigvalsh(key)[-1]
+
+    return float(max(0.0, 2.0 * (e0 - eigenvalue) / len(idx0)))
+
+
+def _get_mapping_scorer(
+    molecule0,
+    molecule1,
+    coordinates0,
+    coordinates1,
+    scoring_function,
+    property_map0,
+    property_map1,
+):
+    """
+    Internal function to return a function that computes the mean squared
+    displacement (MSD) score for a single mapping. The scoring function is
+    resolved once, so that it isn't re-checked for each mapping.
+
+    Parameters
+    ----------
+
+    molecule0 : Sire.Molecule.Molecule
+        The first molecule (Sire representation).
+
+    molecule1 : Sire.Molecule.Molecule
+        The second molecule (Sire representation).
+
+    coordinates0 : numpy.ndarray
+        The coordinates of the atoms in the first molecule.
+
+    coordinates1 : numpy.ndarray
+        The coordinates of the atoms in the second molecule.
+
+    scoring_function : str
+        The RMSD scoring function.
+
+    property_map0 : dict
+        A dictionary that maps "properties" in molecule0 to their user
+        defined values.
+
+    property_map1 : dict
+        A dictionary that maps "properties" in molecule1 to their user
+        defined values.
+
+    Returns
+    -------
+
+    scorer : function
+        A function taking the arrays of matching atom indices in the two
+        molecules and returning the MSD score in Angstrom squared.
+    """
+
+    # Rigidly align molecule0 to molecule1 based on the mapping. Only the
+    # score is needed, so the optimal superposition is computed directly
+    # from the coordinates.
+    if scoring_function == "RMSDALIGN":
+        return _functools.partial(_compute_aligned_msd, coordinates0, coordinates1)
+
+    # Flexibly align a copy of the original molecule0 to molecule1 based on
+    # the mapping, so that the scores don't depend on the order of the
+    # mappings.
+    elif scoring_function == "RMSDFLEXALIGN":
+        return _functools.partial(
+            _compute_flex_aligned_msd,
+            molecule0,
+            molecule1,
+            coordinates1,
+            property_map0,
+            property_map1,
+        )
+
+    else:
+        return _functools.partial(_compute_msd, coordinates0, coordinates1)
+
+
+def _compute_flex_aligned_msd(
+    molecule0, molecule1, coordinates1, property_map0, property_map1, idx0, idx1
+):
+    """
+    Internal function to compute the mean squared displacement (MSD) between
+    the coordinates of mapped atoms in two molecules following a flexible
+    alignment of the first molecule to the second.
+
+    Parameters
+    ----------
+
+    molecule0 : Sire.Molecule.Molecule
+        The first molecule (Sire representation).
+
+    molecule1 : Sire.Molecule.Molecule
+        The second molecule (Sire representation).
+
+    coordinates1 : numpy.ndarray
+        The coordinates of the atoms in the second molecule.
+
+    property_map0 : dict
+        A dictionary that maps "properties" in molecule0 to their user
+        defined values.
+
+    property_map1 : dict
+        A dictionary that maps "properties" in molecule1 to their user
+        defined values.
+
+    idx0 : numpy.ndarray
+        The indices of the mapped atoms in the first molecule.
+
+    idx1 : numpy.ndarray
+        The indices of the atoms in the second molecule that they map to.
+
+    Returns
+    -------
+
+    msd : float
+        The MSD between the mapped atoms after alignment.
+    """
+
+    aligned0 = flexAlign(
+        _Molecule(molecule0),
+        _Molecule(molecule1),
+        _arrays_to_mapping(idx0, idx1),
+        property_map0=property_map0,
+        property_map1=property_map1,
+    )._sire_object
+
+    return _compute_msd(_get_coordinates(aligned0), coordinates1, idx0, idx1)
+
+
+def _contains_prematch(idx0, idx1, prematch0, prematch1):
+    """
+    Internal function to check whether a mapping contains the prematch.
+
+    Parameters
+    ----------
+
+    idx0 : numpy.ndarray
+        The sorted indices of the mapped atoms in the first molecule.
+
+    idx1 : numpy.ndarray
+        The indices of the atoms in the second molecule that they map to.
+
+    prematch0 : numpy.ndarray
+        The indices of the prematched atoms in the first molecule.
+
+    prematch1 : numpy.ndarray
+        The indices of the atoms in the second molecule that they map to.
+
+    Returns
+    -------
+
+    is_valid : bool
+        Whether the mapping contains the prematch.
+    """
+
+    if len(prematch0) == 0:
+        return True
+
+    # Locate the prematched atoms from molecule0 in the mapping.
+    pos = _np.searchsorted(idx0, prematch0)
+    if (pos >= len(idx0)).any():
+        return False
+
+    return bool((idx0[pos] == prematch0).all() and (idx1[pos] == prematch1).all())
+
+
+def _mapping_to_arrays(mapping):
+    """
+    Internal function to convert a mapping to arrays of matching atom
+    indices, sorted by the indices in the first molecule.
+
+    Parameters
+    ----------
+
+    mapping : {int:int}, {Sire.Mol.AtomIdx:Sire.Mol.AtomIdx}
+        The mapping.
+
+    Returns
+    -------
+
+    idx0, idx1 : (numpy.ndarray, numpy.ndarray)
+        The indices of the mapped atoms in the first molecule, and those of
+        the atoms in the second molecule that they map to.
+    """
+
+    mapping = _from_sire_mapping(mapping)
+
+    idx0 = _np.fromiter(mapping.keys(), dtype=_np.int32, count=len(mapping))
+    idx1 = _np.fromiter(mapping.values(), dtype=_np.int32, count=len(mapping))
+
+    order = _np.argsort(idx0, kind="stable")
+
+    return (idx0[order], idx1[order])
+
+
+def _arrays_to_mapping(idx0, idx1):
+    """
+    Internal function to convert arrays of matching atom indices to a
+    regular mapping.
+
+    Parameters
+    ----------
+
+    idx0 : numpy.ndarray
+        The indices of the mapped atoms in the first molecule.
+
+    idx1 : numpy.ndarray
+        The indices of the atoms in the second molecule that they map to.
+
+    Returns
+    -------
+
+    mapping : {int:int}
+        The regular mapping.
+    """
+
+    return dict(zip(idx0.tolist(), idx1.tolist()))
+
+
+def _find_sire_mcs_matches(
+    molecule0, molecule1, prematch, timeout, property_map0, property_map1
+):
+    """
+    Internal function to perform the two maximum common substructure (MCS)
+    searches used when falling back on Sire. The first is a regular match
+    that includes light atoms, but doesn't allow matches between heavy and
+    light atoms. The second also allows matches between heavy and light atoms,
+    which captures mappings such as O --> H in methane to methanol. The two
+    searches are independent, so are run concurrently when possible. When
+    run in serial, the second search is skipped if the first already matches
+    all atoms in the smaller molecule.
+
+    Parameters
+    ----------
+
+    molecule0 : Sire.Mol.Molecule
+        The first molecule (Sire representation).
+
+    molecule1 : Sire.Mol.Molecule
+        The second molecule (Sire representation).
+
+    prematch : dict
+        A dictionary of atom mappings that must be included in the match.
+
+    timeout : Sire.Units.GeneralUnit
+        The timeout for each MCS search.
+
+    property_map0 : dict
+        A dictionary that maps "properties" in molecule0 to their user
+        defined values. This allows the user to refer to properties
+        with their own naming scheme, e.g. { "charge" : "my-charge" }
+
+    property_map1 : dict
+        A dictionary that maps "properties" in molecule1 to their user
+        defined values.
+
+    Returns
+    -------
+
+    m0, m1 : ([{Sire.Mol.AtomIdx:Sire.Mol.AtomIdx}], [{Sire.Mol.AtomIdx:Sire.Mol.AtomIdx}])
+        The mappings from the regular and heavy-to-light matches. The latter
+        is empty if the second search was skipped.
+    """
+
+    # Create the evaluator and the matcher for the prematch.
+    evaluator = molecule0.evaluate()
+    matcher = _SireMol.AtomResultMatcher(_to_sire_mapping(prematch))
+
+    # The arguments for each search. These only differ by the minimum mass
+    # used to define a heavy atom.
+    args = [
+        (molecule1, matcher, timeout, True, property_map0, property_map1, 6, False),
+        (molecule1, matcher, timeout, True, property_map0, property_map1, 0, False),
+    ]
+
+    # The largest possible number of matched atoms. If the regular match
+    # contains this many atoms, then the second search can't improve on it.
+    max_matches = min(molecule0.nAtoms(), molecule1.nAtoms())
+
+    def is_maximal(matches):
+        return len(matches) > 0 and len(matches[0]) >= max_matches
+
+    # Run the searches in serial if there is only a single core available.
+    if (_os.cpu_count() or 1) < 2:
+        m0 = evaluator.findMCSmatches(*args[0])
+        if is_maximal(m0):
+            return (m0, [])
+        return (m0, evaluator.findMCSmatches(*args[1]))
+
+    # The searches run in C++, so can overlap when run in separate threads.
+    # Both are started together, so both results are returned. The larger
+    # match is selected by the caller.
+    with _ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(evaluator.findMCSmatches, *x) for x in args]
+        return (futures[0].result(), futures[1].result())
+
+
+def _validate_molecule_args(molecule0, molecule1, property_map0, property_map1):
+    """
+    Internal function to validate the molecule and property map arguments
+    that are common to the alignment functions.
+
+    Parameters
+    ----------
+
+    molecule0 : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`
+        The molecule of interest.
+
+    molecule1 : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`
+        The reference molecule.
+
+    property_map0 : dict
+        A dictionary that maps "properties" in molecule0 to their user
+        defined values.
+
+    property_map1 : dict
+        A dictionary that maps "properties" in molecule1 to their user
+        defined values.
+    """
+
+    if not isinstance(molecule0, _Molecule):
+        raise TypeError(
+            "'molecule0' must be of type 'BioSimSpace._SireWrappers.Molecule'"
+        )
+
+    if not isinstance(molecule1, _Molecule):
+        raise TypeError(
+            "'molecule1' must be of type 'BioSimSpace._SireWrappers.Molecule'"
+        )
+
+    if not isinstance(property_map0, dict):
+        raise TypeError("'property_map0' must be of type 'dict'")
+
+    if not isinstance(property_map1, dict):
+        raise TypeError("'property_map1' must be of type 'dict'")
+
+
+def _validate_mapping(molecule0, molecule1, mapping, name):
+    """
+    Internal function to validate that a mapping contains key:value pairs
+    of the correct type.
+
+    Parameters
+    ----------
+
+    molecule0 : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`
+        The molecule of interest.
+
+    molecule1 : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`
+        The reference molecule.
 
     mapping : dict
         The mapping between matching atom indices in the two molecules.
@@ -2873,10 +3451,16 @@ def _validate_mapping(molecule0, molecule1, mapping, name):
         The name of the mapping. (Used when raising exceptions.)
     """
 
+    AtomIdx = _SireMol.AtomIdx
+
+    # Store the number of atoms in each molecule, since these are invariant.
+    n0 = molecule0.nAtoms()
+    n1 = molecule1.nAtoms()
+
     for idx0, idx1 in mapping.items():
         if type(idx0) is int and type(idx1) is int:
             pass
-        elif isinstance(idx0, _SireMol.AtomIdx) and isinstance(idx1, _SireMol.AtomIdx):
+        elif isinstance(idx0, AtomIdx) and isinstance(idx1, AtomIdx):
             idx0 = idx0.value()
             idx1 = idx1.value()
         else:
@@ -2884,16 +3468,10 @@ def _validate_mapping(molecule0, molecule1, mapping, name):
                 "%r dictionary key:value pairs must be of type 'int' or "
                 "'Sire.Mol.AtomIdx'" % name
             )
-        if (
-            idx0 < 0
-            or idx0 >= molecule0.nAtoms()
-            or idx1 < 0
-            or idx1 >= molecule1.nAtoms()
-        ):
+        if not (0 <= idx0 < n0 and 0 <= idx1 < n1):
             raise ValueError(
                 "%r dictionary key:value pair '%s : %s' is out of range! "
-                "The molecules contain %d and %d atoms."
-                % (name, idx0, idx1, molecule0.nAtoms(), molecule1.nAtoms())
+                "The molecules contain %d and %d atoms." % (name, idx0, idx1, n0, n1)
             )
 
 
@@ -2926,6 +3504,29 @@ def _validate_roi(molecules, roi):
                 )
 
 
+@_functools.lru_cache(maxsize=4096)
+def _atom_idx(idx):
+    """
+    Internal function to return a cached Sire AtomIdx object for an index.
+    This avoids repeatedly constructing the same index objects when
+    converting mappings.
+
+    Parameters
+    ----------
+
+    idx : int
+        The atom index.
+
+    Returns
+    -------
+
+    atom_idx : Sire.Mol.AtomIdx
+        The Sire atom index.
+    """
+
+    return _SireMol.AtomIdx(idx)
+
+
 def _to_sire_mapping(mapping):
     """
     Internal function to convert a regular mapping to Sire AtomIdx format.
@@ -2951,7 +3552,7 @@ def _to_sire_mapping(mapping):
         if isinstance(idx0, _SireMol.AtomIdx):
             return mapping
         else:
-            sire_mapping[_SireMol.AtomIdx(idx0)] = _SireMol.AtomIdx(idx1)
+            sire_mapping[_atom_idx(idx0)] = _atom_idx(idx1)
 
     return sire_mapping
 
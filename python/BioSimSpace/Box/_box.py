@@ -270,13 +270,15 @@ import sys as _sys
 
 _namespace = _sys.modules[__name__]
 for _var in dir():
-    if _var[0] != "_" and _var[0].upper() != "G":
+    _c = _var[0]
+    if _c != "_" and _c != "G" and _c != "g":
         _box_types.append(_var)
         _box_types_lower.append(_var.lower())
         _box_types_dict[_var.lower()] = getattr(_namespace, _var)
 del _namespace
 del _sys
 del _var
+del _c
 
 
 def boxTypes():
@@ -83,6 +83,9 @@ _cache = _FixedSizeOrderedDict()
 # Whether to use the cache.
 _use_cache = True
 
+# The size of the chunks used when computing the MD5 checksum of a file.
+_md5_chunk_size = 1 << 20
+
 
 def clearCache():
     """
@@ -206,7 +209,7 @@ def _check_cache(
 
     # Get the existing file path and MD5 hash from the cache.
     try:
-        (prev_system, path, original_hash) = _cache[key]
+        prev_system, path, original_hash = _cache[key]
     except:
         return False
 
@@ -353,11 +356,17 @@ def _get_md5_hash(path):
     hash : hashlib.HASH
     """
     # Get the MD5 hash of the file. Process in chunks in case the file is too
-    # large to process.
+    # large to process, reading into a re-usable buffer to avoid allocating a
+    # new bytes object for each chunk.
     hash = _hashlib.md5()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash.update(chunk)
+    buffer = bytearray(_md5_chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            hash.update(view[:size])
 
     return hash.hexdigest()
 
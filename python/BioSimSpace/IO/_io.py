@@ -763,84 +763,12 @@ def saveMolecules(
             files.append(_os.path.abspath(filebase + ext))
             continue
 
-        # Add the file format to the property map.
-        _property_map["fileformat"] = format
-
-        # Warn the user if any molecules are parameterised with a force field
-        # that uses geometric combining rules. While we can write this to file
-        # the information is lost on read.
-        if format.upper() == "PRM7":
-            # Get the name of the "forcefield" property.
-            forcefield = _property_map.get("forcefield", "forcefield")
-
-            # Loop over all molecules in the system.
-            for mol in system.getMolecules():
-                if mol._sire_object.hasProperty(forcefield):
-                    if (
-                        mol._sire_object.property(forcefield).combiningRules()
-                        == "geometric"
-                    ):
-                        _warnings.warn(
-                            "AMBER topology files do not support force fields that "
-                            "use geometric combining rules, as this cannot be specified "
-                            "in the file. When this file is re-read, then arithmetic "
-                            "combining rules will be assumed."
-                        )
-                        # Exit after the first non-arithmetic molecule we encounter.
-                        break
-
-        # Write the file.
+        # Write the file. Each format gets its own copy of the property map,
+        # so that format specific options don't affect later formats.
         try:
-            # Make sure AMBER and GROMACS files have the expected water topology
-            # and save GROMACS files with an extension such that they can be run
-            # directly by GROMACS without needing to be renamed.
-            if format.upper() == "PRM7":
-                if match_water:
-                    system_copy = system.copy()
-                    system_copy._set_water_topology("AMBER", property_map=_property_map)
-                else:
-                    system_copy = system
-                file = _SireIO.MoleculeParser.save(
-                    system_copy._sire_object, filebase, _property_map
-                )
-            elif format.upper() == "GROTOP":
-                if match_water:
-                    system_copy = system.copy()
-                    system_copy._set_water_topology(
-                        "GROMACS", property_map=_property_map
-                    )
-                else:
-                    system_copy = system
-                    _property_map["skip_water"] = _SireBase.wrap(True)
-                file = _SireIO.MoleculeParser.save(
-                    system_copy._sire_object, filebase, _property_map
-                )[0]
-                new_file = file.replace("grotop", "top")
-                _os.rename(file, new_file)
-                file = [new_file]
-            elif format.upper() == "GRO87":
-                if match_water:
-                    system_copy = system.copy()
-                    system_copy._set_water_topology(
-                        "GROMACS", property_map=_property_map
-                    )
-                else:
-                    system_copy = system
-                    _property_map["skip_water"] = _SireBase.wrap(True)
-                # Write to 3dp by default, unless greater precision is
-                # requested by the user.
-                if "precision" not in _property_map:
-                    _property_map["precision"] = _SireBase.wrap(3)
-                file = _SireIO.MoleculeParser.save(
-                    system_copy._sire_object, filebase, _property_map
-                )[0]
-                new_file = file.replace("gro87", "gro")
-                _os.rename(file, new_file)
-                file = [new_file]
-            else:
-                file = _SireIO.MoleculeParser.save(
-                    system._sire_object, filebase, _property_map
-                )
+            file = _save_format(
+                system, filebase, format, match_water, _property_map.copy()
+            )
 
             files += file
 
@@ -861,6 +789,114 @@ def saveMolecules(
     return files
 
 
+def _save_format(system, filebase, format, match_water, property_map):
+    """
+    Internal helper function to save a molecular system to a single file
+    format.
+
+    Parameters
+    ----------
+
+    system : :class:`System <BioSimSpace._SireWrappers.System>`
+        The molecular system.
+
+    filebase : str
+        The base name of the output files.
+
+    format : str
+        The file format.
+
+    match_water : bool
+        Whether to update the naming of water molecules to match the expected
+        convention for the chosen file format.
+
+    property_map : dict
+        A dictionary that maps system "properties" to their user
+        defined values. This is modified, so should be a copy.
+
+    Returns
+    -------
+
+    files : [str]
+        The list of files that were generated.
+    """
+
+    _property_map = property_map
+
+    # Add the file format to the property map.
+    _property_map["fileformat"] = format
+
+    # Warn the user if any molecules are parameterised with a force field
+    # that uses geometric combining rules. While we can write this to file
+    # the information is lost on read.
+    if format.upper() == "PRM7":
+        # Get the name of the "forcefield" property.
+        forcefield = _property_map.get("forcefield", "forcefield")
+
+        # Loop over all molecules in the system.
+        for mol in system.getMolecules():
+            if mol._sire_object.hasProperty(forcefield):
+                if (
+                    mol._sire_object.property(forcefield).combiningRules()
+                    == "geometric"
+                ):
+                    _warnings.warn(
+                        "AMBER topology files do not support force fields that "
+                        "use geometric combining rules, as this cannot be specified "
+                        "in the file. When this file is re-read, then arithmetic "
+                        "combining rules will be assumed."
+                    )
+                    # Exit after the first non-arithmetic molecule we encounter.
+                    break
+
+    # Make sure AMBER and GROMACS files have the expected water topology
+    # and save GROMACS files with an extension such that they can be run
+    # directly by GROMACS without needing to be renamed.
+    if format.upper() == "PRM7":
+        if match_water:
+            system_copy = system.copy()
+            system_copy._set_water_topology("AMBER", property_map=_property_map)
+        else:
+            system_copy = system
+        file = _SireIO.MoleculeParser.save(
+            system_copy._sire_object, filebase, _property_map
+        )
+    elif format.upper() == "GROTOP":
+        if match_water:
+            system_copy = system.copy()
+            system_copy._set_water_topology("GROMACS", property_map=_property_map)
+        else:
+            system_copy = system
+            _property_map["skip_water"] = _SireBase.wrap(True)
+        file = _SireIO.MoleculeParser.save(
+            system_copy._sire_object, filebase, _property_map
+        )[0]
+        new_file = file.replace("grotop", "top")
+        _os.rename(file, new_file)
+        file = [new_file]
+    elif format.upper() == "GRO87":
+        if match_water:
+            system_copy = system.copy()
+            system_copy._set_water_topology("GROMACS", property_map=_property_map)
+        else:
+            system_copy = system
+            _property_map["skip_water"] = _SireBase.wrap(True)
+        # Write to 3dp by default, unless greater precision is
+        # requested by the user.
+        if "precision" not in _property_map:
+            _property_map["precision"] = _SireBase.wrap(3)
+        file = _SireIO.MoleculeParser.save(
+            system_copy._sire_object, filebase, _property_map
+        )[0]
+        new_file = file.replace("gro87", "gro")
+        _os.rename(file, new_file)
+        file = [new_file]
+    else:
+        file = _SireIO.MoleculeParser.save(system._sire_object, filebase, _property_map)
+
+    return file
+
+
 def savePerturbableSystem(filebase, system, property_map={}):
     """
     Save a system containing a perturbable molecule. This will be written in
@@ -34,9 +34,12 @@ __all__ = ["AmberProtein", "GAFF"]
 # of the classes.
 
 import glob as _glob
+import hashlib as _hashlib
 import os as _os
 import queue as _queue
+import shutil as _shutil
 import subprocess as _subprocess
+import tempfile as _tempfile
 import warnings as _warnings
 
 from ..._Utils import _try_import, _have_imported
@@ -71,6 +74,7 @@ from ..._Exceptions import ParameterisationError as _ParameterisationError
 from ..._Exceptions import ThirdPartyError as _ThirdPartyError
 from ..._SireWrappers import Atom as _Atom
 from ..._SireWrappers import Molecule as _Molecule
+from ...Parameters._cache import _get_cache_dir
 from ...Parameters._utils import formalCharge as _formalCharge
 from ...Types import Charge as _Charge
 from ...Types import Length as _Length
@@ -112,6 +116,9 @@ if _amber_home is not None:
     if not _os.path.isfile(_parmchk_exe):
         raise IOError("Missing parmchk executable: '%s'" % _parmchk_exe)
 
+# The files from GAFF parameterisations that are stored in the cache.
+_param_cache_files = ("leap.top", "leap.crd", "leap.out")
+
 
 class AmberProtein(_protocol.Protocol):
     """A class for handling AMBER protein force field models."""
@@ -1086,6 +1093,97 @@ class GAFF(_protocol.Protocol):
             charge,
         )
 
+        # Try to find a force field file.
+        if self._version == 1:
+            ff = _find_force_field("gaff")
+        else:
+            ff = _find_force_field("gaff2")
+
+        # Re-use the output of a previous parameterisation with the same input,
+        # if available. Otherwise, run Antechamber, ParmChk, and tLEaP.
+        cache_key = _get_cache_key(
+            _os.path.join(str(work_dir), "antechamber.%s" % format), command, ff
+        )
+        if not _load_cached_output(cache_key, str(work_dir)):
+            self._run_antechamber(command, ff, str(work_dir))
+            _save_cached_output(cache_key, str(work_dir))
+
+        # Check the output of tLEaP for missing atoms.
+        if self._ensure_compatible:
+            if _has_missing_atoms(_os.path.join(str(work_dir), "leap.out")):
+                raise _ParameterisationError(
+                    "tLEaP added missing atoms. The topology is now "
+                    "inconsistent with the original molecule. Please "
+                    "make sure that your initial molecule has a "
+                    "complete topology."
+                )
+
+        # Load the parameterised molecule. (This could be a system of molecules.)
+        try:
+            par_mol = _IO.readMolecules(
+                [
+                    _os.path.join(str(work_dir), "leap.top"),
+                    _os.path.join(str(work_dir), "leap.crd"),
+                ],
+            )
+            # Extract single molecules.
+            if par_mol.nMolecules() == 1:
+                par_mol = par_mol.getMolecules()[0]
+        except Exception as e:
+            msg = "Failed to read molecule from: 'leap.top', 'leap.crd'"
+            if _isVerbose():
+                msg += ": " + getattr(e, "message", repr(e))
+                raise IOError(msg) from e
+            else:
+                raise IOError(msg) from None
+
+        # Make the molecule 'mol' compatible with 'par_mol'. This will create
+        # a mapping between atom indices in the two molecules and add all of
+        # the new properties from 'par_mol' to 'mol'.
+        if self._ensure_compatible:
+            new_mol.makeCompatibleWith(
+                par_mol,
+                property_map=self._property_map,
+                overwrite=True,
+                verbose=False,
+            )
+        else:
+            try:
+                new_mol.makeCompatibleWith(
+                    par_mol,
+                    property_map=self._property_map,
+                    overwrite=True,
+                    verbose=False,
+                )
+            except:
+                new_mol = par_mol
+
+        # Record the forcefield used to parameterise the molecule.
+        new_mol._forcefield = ff
+
+        if queue is not None:
+            queue.put(new_mol)
+        return new_mol
+
+    def _run_antechamber(self, command, ff, work_dir):
+        """
+        Internal helper function to run Antechamber, ParmChk, and tLEaP to
+        generate the parameterised topology and coordinate files, leap.top
+        and leap.crd, in the working directory.
+
+        Parameters
+        ----------
+
+        command : str
+            The Antechamber command.
+
+        ff : str
+            The path to the tLEaP force field file.
+
+        work_dir : str
+            The working directory.
+        """
+
         with open(_os.path.join(str(work_dir), "README.txt"), "w") as file:
             # Write the command to file.
             file.write("# Antechamber was run with the following command:\n")
@@ -1140,12 +1238,6 @@ class GAFF(_protocol.Protocol):
                 # tLEap will run in the same working directory, using the Mol2 file generated by
                 # Antechamber.
 
-                # Try to find a force field file.
-                if self._version == 1:
-                    ff = _find_force_field("gaff")
-                else:
-                    ff = _find_force_field("gaff2")
-
                 # Write the LEaP input file.
                 with open(_os.path.join(str(work_dir), "leap.txt"), "w") as file:
                     file.write("source %s\n" % ff)
@@ -1179,73 +1271,15 @@ class GAFF(_protocol.Protocol):
 
                 # tLEaP doesn't return sensible error codes, so we need to check that
                 # the expected output was generated.
-                if _os.path.isfile(
+                if not _os.path.isfile(
                     _os.path.join(str(work_dir), "leap.top")
-                ) and _os.path.isfile(_os.path.join(str(work_dir), "leap.crd")):
-                    # Check the output of tLEaP for missing atoms.
-                    if self._ensure_compatible:
-                        if _has_missing_atoms(_os.path.join(str(work_dir), "leap.out")):
-                            raise _ParameterisationError(
-                                "tLEaP added missing atoms. The topology is now "
-                                "inconsistent with the original molecule. Please "
-                                "make sure that your initial molecule has a "
-                                "complete topology."
-                            )
-
-                    # Load the parameterised molecule. (This could be a system of molecules.)
-                    try:
-                        par_mol = _IO.readMolecules(
-                            [
-                                _os.path.join(str(work_dir), "leap.top"),
-                                _os.path.join(str(work_dir), "leap.crd"),
-                            ],
-                        )
-                        # Extract single molecules.
-                        if par_mol.nMolecules() == 1:
-                            par_mol = par_mol.getMolecules()[0]
-                    except Exception as e:
-                        msg = "Failed to read molecule from: 'leap.top', 'leap.crd'"
-                        if _isVerbose():
-                            msg += ": " + getattr(e, "message", repr(e))
-                            raise IOError(msg) from e
-                        else:
-                            raise IOError(msg) from None
-
-                    # Make the molecule 'mol' compatible with 'par_mol'. This will create
-                    # a mapping between atom indices in the two molecules and add all of
-                    # the new properties from 'par_mol' to 'mol'.
-                    if self._ensure_compatible:
-                        new_mol.makeCompatibleWith(
-                            par_mol,
-                            property_map=self._property_map,
-                            overwrite=True,
-                            verbose=False,
-                        )
-                    else:
-                        try:
-                            new_mol.makeCompatibleWith(
-                                par_mol,
-                                property_map=self._property_map,
-                                overwrite=True,
-                                verbose=False,
-                            )
-                        except:
-                            new_mol = par_mol
-
-                    # Record the forcefield used to parameterise the molecule.
-                    new_mol._forcefield = ff
-
-                else:
+                ) or not _os.path.isfile(_os.path.join(str(work_dir), "leap.crd")):
                     raise _ParameterisationError("tLEaP failed!")
             else:
                 raise _ParameterisationError("Parmchk failed!")
         else:
             raise _ParameterisationError("Antechamber failed!")
 
-        if queue is not None:
-            queue.put(new_mol)
-        return new_mol
-
 
 def _find_force_field(forcefield):
     """
@@ -1325,3 +1359,134 @@ def _has_missing_atoms(tleap_file):
                 return True
 
     return False
+
+
+def _get_cache_key(input_file, command, forcefield):
+    """
+    Internal helper function to generate the key used to cache the output of
+    a GAFF parameterisation. The output depends on the Antechamber input
+    file, the Antechamber command, the force field, and the AmberTools
+    programs that are used. The programs are identified by their path and
+    modification time, so that the cache isn't re-used after AmberTools is
+    upgraded in place.
+
+    Parameters
+    ----------
+
+    input_file : str
+        The path to the Antechamber input file.
+
+    command : str
+        The Antechamber command.
+
+    forcefield : str
+        The tLEaP force field file.
+
+    Returns
+    -------
+
+    key : str
+        The cache key. This is None if caching is disabled.
+    """
+
+    if _get_cache_dir() is None:
+        return None
+
+    key = _hashlib.sha1()
+    with open(input_file, "rb") as file:
+        key.update(file.read())
+    key.update(command.encode())
+    key.update(forcefield.encode())
+
+    # Add the AmberTools programs. Antechamber runs sqm to compute charges.
+    exes = [_antechamber_exe, _parmchk_exe, _tleap_exe]
+    if _amber_home is not None:
+        exes.append("%s/bin/sqm" % _amber_home)
+    for exe in exes:
+        if exe is not None and _os.path.isfile(exe):
+            stat = _os.stat(exe)
+            key.update(f"{exe}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+
+    return key.hexdigest()
+
+
+def _load_cached_output(key, work_dir):
+    """
+    Internal helper function to copy the cached output of a GAFF
+    parameterisation into the working directory.
+
+    Parameters
+    ----------
+
+    key : str
+        The cache key.
+
+    work_dir : str
+        The working directory.
+
+    Returns
+    -------
+
+    is_cached : bool
+        Whether the cached output was found.
+    """
+
+    if key is None:
+        return False
+
+    cache_dir = _os.path.join(_get_cache_dir(), key)
+
+    for name in _param_cache_files:
+        if not _os.path.isfile(_os.path.join(cache_dir, name)):
+            return False
+
+    for name in _param_cache_files:
+        _shutil.copyfile(_os.path.join(cache_dir, name), _os.path.join(work_dir, name))
+
+    with open(_os.path.join(work_dir, "README.txt"), "a") as file:
+        file.write("# Loaded cached parameterisation output from:\n")
+        file.write("%s\n" % cache_dir)
+
+    return True
+
+
+def _save_cached_output(key, work_dir):
+    """
+    Internal helper function to store the output of a GAFF parameterisation
+    in the cache. Failure to write to the cache is not an error.
+
+    Parameters
+    ----------
+
+    key : str
+        The cache key.
+
+    work_dir : str
+        The working directory.
+    """
+
+    if key is None:
+        return
+
+    root_dir = _get_cache_dir()
+    cache_dir = _os.path.join(root_dir, key)
+
+    if _os.path.isdir(cache_dir):
+        return
+
+    try:
+        # Write to a temporary directory, then rename, so that other processes
+        # never see a partially written cache entry.
+        _os.makedirs(root_dir, exist_ok=True)
+        tmp_dir = _tempfile.mkdtemp(dir=root_dir)
+        for name in _param_cache_files:
+            _shutil.copyfile(
+                _os.path.join(work_dir, name), _os.path.join(tmp_dir, name)
+            )
+        try:
+            _os.rename(tmp_dir, cache_dir)
+        except OSError:
+            # Another process has already cached the same output.
+            _shutil.rmtree(tmp_dir, ignore_errors=True)
+    except OSError as e:
+        _warnings.warn(f"Unable to cache parameterisation output: {e}")
@@ -166,3 +166,19 @@ the molecule.
 
 from ._parameters import *
 from ._utils import *
+
+from . import _parameters
+
+
+def __getattr__(name):
+    # Functions for the force fields from the Open Force Field Initiative
+    # are created on first use.
+    if not name.startswith("_"):
+        return getattr(_parameters, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    _parameters._discover_openff()
+    return sorted(set(globals()) | set(_parameters.__all__))
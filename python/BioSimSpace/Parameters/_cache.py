@@ -0,0 +1,51 @@
+######################################################################
+# BioSimSpace: Making biomolecular simulation a breeze!
+#
+# Copyright: 2017-2024
+#
+# Authors: Lester Hedges <lester.hedges@gmail.com>
+#
+# BioSimSpace is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BioSimSpace is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BioSimSpace. If not, see <http://www.gnu.org/licenses/>.
+#####################################################################
+
+"""Settings for caching the output of parameterisation."""
+
+__author__ = "Lester Hedges"
+__email__ = "lester.hedges@gmail.com"
+
+import os as _os
+
+# The directory used to cache parameterisation output, such as the output of
+# GAFF parameterisations and the names of the available Open Force Field
+# force fields. Caching is enabled by setting the BSS_PARAM_CACHE environment
+# variable.
+
+_cache_dir = _os.environ.get("BSS_PARAM_CACHE")
+
+if _cache_dir is not None:
+    _cache_dir = _os.path.abspath(_os.path.expanduser(_cache_dir))
+
+
+def _get_cache_dir():
+    """
+    Internal function to return the directory used to cache parameterisation
+    output.
+
+    Returns
+    -------
+
+    cache_dir : str
+        The cache directory. This is None if caching is disabled.
+    """
+    return _cache_dir
@@ -29,6 +29,7 @@ __email__ = "lester.hedges@gmail.com"
 # supported AMBER and Open Force Field models determined at import time.
 __all__ = [
     "parameterise",
+    "parameteriseMany",
     "forceFields",
     "amberForceFields",
     "amberProteinForceFields",
@@ -49,6 +50,13 @@ _amber_protein_forcefields = {
     "ff14SB": False,
 }
 
+# A dictionary mapping GAFF force field names to their version.
+_gaff_forcefields = {"gaff": 1, "gaff2": 2}
+
+import os as _os
+
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+
 from .. import _amber_home, _gmx_exe, _gmx_path, _isVerbose
 
 from .._Exceptions import IncompatibleError as _IncompatibleError
@@ -61,16 +69,23 @@ from ..Types import Length as _Length
 from .._Utils import _try_import, _have_imported
 from .. import _Utils
 
+from ._cache import _get_cache_dir
 from ._process import Process as _Process
+from ._process import _reserve_workers
 from . import _Protocol
 
+# Whether AmberTools and GROMACS are available. These are fixed at import, so
+# only need to be checked once.
+_has_amber = _amber_home is not None
+_has_gromacs = _gmx_exe is not None and _gmx_path is not None
+
 
 def parameterise(
     molecule,
     forcefield,
     ensure_compatible=True,
     work_dir=None,
-    property_map={},
+    property_map=None,
     **kwargs,
 ):
     """
@@ -119,21 +134,136 @@ def parameterise(
 
     if not isinstance(forcefield, str):
         raise TypeError("'forcefield' must be of type 'str'")
-    else:
-        # Strip whitespace and convert to lower case.
-        forcefield = forcefield.replace(" ", "").lower()
+    elif forcefield not in _forcefield_dict:
+        # Strip whitespace and convert to lower case. Intern the name so
+        # that the look-ups below can match keys by identity.
+        forcefield = _sys.intern(forcefield.translate(_ff_name_table).lower())
+
+        if forcefield not in _forcefield_dict:
+            # Make sure the Open Force Field force fields have been found.
+            _discover_openff()
 
-        if forcefield not in _forcefields_lower:
-            raise ValueError("Supported force fields are: %s" % forceFields())
+            if forcefield not in _forcefield_dict:
+                raise ValueError("Supported force fields are: %s" % forceFields())
 
     return _forcefield_dict[forcefield](
         molecule, work_dir=work_dir, property_map=property_map, **kwargs
     )
 
 
+def parameteriseMany(
+    molecules,
+    forcefield,
+    work_dir=None,
+    max_workers=None,
+    property_map=None,
+    **kwargs,
+):
+    """
+    Parameterise a list of molecules using a specified force field. The
+    molecules are parameterised concurrently, which is useful when preparing
+    a library of ligands since each parameterisation is run by external,
+    single threaded, programs.
+
+    Parameters
+    ----------
+
+    molecules : [:class:`Molecule <BioSimSpace._SireWrappers.Molecule>`, str]
+        The molecules to parameterise, either as Molecule objects or SMILES
+        strings.
+
+    forcefield : str
+        The force field. Run BioSimSpace.Parameters.forceFields() to get a
+        list of the supported force fields.
+
+    work_dir : str
+        The working directory for the processes. If set, each molecule is
+        parameterised in a numbered sub-directory, ordered as the input.
+
+    max_workers : int
+        The maximum number of molecules to parameterise at once. If None,
+        then the number of available CPUs is used. The shared pool used to
+        run parameterisation processes is enlarged if needed, so that this
+        many can run concurrently.
+
+    property_map : dict
+        A dictionary that maps system "properties" to their user defined
+        values. This allows the user to refer to properties with their
+        own naming scheme, e.g. { "charge" : "my-charge" }
+
+    kwargs : dict
+        A dictionary of additional keyword arguments required for specific
+        parameterisation functions.
+
+    Returns
+    -------
+
+    molecules : [:class:`Molecule <BioSimSpace._SireWrappers.Molecule>`]
+        The parameterised molecules, in the same order as the input.
+    """
+
+    if not isinstance(molecules, (list, tuple)):
+        raise TypeError(
+            "'molecules' must be a list of "
+            "'BioSimSpace._SireWrappers.Molecule' or 'str' types."
+        )
+
+    if work_dir is not None and not isinstance(work_dir, str):
+        raise TypeError("'work_dir' must be of type 'str'")
+
+    if max_workers is not None:
+        if not type(max_workers) is int:
+            raise TypeError("'max_workers' must be of type 'int'")
+        if max_workers < 1:
+            raise ValueError("'max_workers' must be >= 1")
+    else:
+        max_workers = _os.cpu_count() or 1
+
+    # Parameterise a single molecule, blocking until it is complete. This
+    # runs on a worker thread, while the process itself runs externally.
+    def _parameterise(index):
+        if work_dir is None:
+            mol_work_dir = None
+        else:
+            mol_work_dir = _os.path.join(work_dir, str(index))
+        return parameterise(
+            molecules[index],
+            forcefield,
+            work_dir=mol_work_dir,
+            property_map=property_map,
+            **kwargs,
+        ).getMolecule()
+
+    # Validate the force field before starting any parameterisations.
+    if not isinstance(forcefield, str):
+        raise TypeError("'forcefield' must be of type 'str'")
+    elif forcefield not in _forcefield_dict:
+        # Strip whitespace and convert to lower case.
+        name = forcefield.translate(_ff_name_table).lower()
+
+        if name not in _forcefield_dict:
+            # Make sure the Open Force Field force fields have been found.
+            _discover_openff()
+
+            if name not in _forcefield_dict:
+                raise ValueError("Supported force fields are: %s" % forceFields())
+
+    if len(molecules) == 0:
+        return []
+
+    max_workers = min(max_workers, len(molecules))
+
+    # Make sure the processes aren't limited by the size of the shared pool.
+    _reserve_workers(max_workers)
+
+    with _ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_parameterise, range(len(molecules))))
+
+
 def _parameterise_amber_protein(
     forcefield,
     molecule,
+    *,
     tolerance=1.2,
     max_distance=_Length(6, "A"),
     water_model=None,
@@ -142,8 +272,7 @@ def _parameterise_amber_protein(
     bonds=None,
     ensure_compatible=True,
     work_dir=None,
-    property_map={},
-    **kwargs,
+    property_map=None,
 ):
     """
     Parameterise using the named AMBER protein force field.
@@ -216,6 +345,9 @@ def _parameterise_amber_protein(
         parameterisation is complete and get the parameterised molecule.
     """
 
+    if property_map is None:
+        property_map = {}
+
     if not isinstance(forcefield, str):
         raise TypeError("'forcefield' must be of type 'str'.")
 
@@ -228,18 +360,8 @@ def _parameterise_amber_protein(
     # Extract the pdb2gmx support flag.
     is_pdb2gmx = _amber_protein_forcefields[forcefield]
 
-    if _amber_home is None:
-        if is_pdb2gmx and (_gmx_exe is None or _gmx_path is None):
-            raise _MissingSoftwareError(
-                "'BioSimSpace.Parameters.ff99' is not supported. "
-                "Please install AmberTools (http://ambermd.org) or "
-                "GROMACS (http://www.gromacs.org)."
-            )
-        else:
-            raise _MissingSoftwareError(
-                "'BioSimSpace.Parameters.ff99' is not supported. "
-                "Please install AmberTools (http://ambermd.org)."
-            )
+    # Make sure the required software is available.
+    _check_software(forcefield, pdb2gmx=is_pdb2gmx)
 
     # Validate arguments.
     _validate(
@@ -280,7 +402,7 @@ def gaff(
     net_charge=None,
     charge_method="BCC",
     ensure_compatible=True,
-    property_map={},
+    property_map=None,
     **kwargs,
 ):
     """
@@ -324,66 +446,98 @@ def gaff(
         parameterisation is complete and get the parameterised molecule.
     """
 
-    if _amber_home is None:
-        raise _MissingSoftwareError(
-            "'BioSimSpace.Parameters.gaff' is not supported. "
-            "Please install AmberTools (http://ambermd.org)."
-        )
-
-    # Validate arguments.
-    _validate(
-        molecule=molecule,
-        check_ions=False,
+    return _parameterise_gaff(
+        "gaff",
+        molecule,
+        work_dir=work_dir,
+        net_charge=net_charge,
+        charge_method=charge_method,
         ensure_compatible=ensure_compatible,
         property_map=property_map,
     )
 
-    if net_charge is not None:
-        # Get the value of the charge.
-        if isinstance(net_charge, _Charge):
-            net_charge = net_charge.value()
 
-        if isinstance(net_charge, float):
-            if net_charge % 1 != 0:
-                raise ValueError("'net_charge' must be integer valued.")
+def gaff2(
+    molecule,
+    work_dir=None,
+    net_charge=None,
+    charge_method="BCC",
+    ensure_compatible=True,
+    property_map=None,
+    **kwargs,
+):
+    """
+    Parameterise using the GAFF2 force field.
 
-        # Try to convert to int.
-        try:
-            net_charge = int(net_charge)
-        except:
-            raise TypeError(
-                "'net_charge' must be of type 'int', or `BioSimSpace.Types.Charge'"
-            )
+    Parameters
+    ----------
 
-    # Create a default protocol.
-    protocol = _Protocol.GAFF(
-        version=1,
+    molecule : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`, str
+        The molecule to parameterise, either as a Molecule object or SMILES
+        string.
+
+    net_charge : int, :class:`Charge <BioSimSpace.Types.Charge>`
+        The net charge on the molecule.
+
+    charge_method : str
+            The method to use when calculating atomic charges:
+            "RESP", "CM2", "MUL", "BCC", "ESP", "GAS"
+
+    ensure_compatible : bool
+        Whether to ensure that the topology of the parameterised molecule is
+        compatible with that of the original molecule. An exception will be
+        raised if this isn't the case, e.g. if atoms have been added. When True,
+        the parameterised molecule will preserve the topology of the original
+        molecule, e.g. the original atom and residue names will be kept.
+
+    work_dir : str
+        The working directory for the process.
+
+    property_map : dict
+        A dictionary that maps system "properties" to their user defined
+        values. This allows the user to refer to properties with their
+        own naming scheme, e.g. { "charge" : "my-charge" }
+
+    Returns
+    -------
+
+    process : :class:`Process <BioSimSpace.Parameters._process.Process>`
+        A process to parameterise the molecule in the background. Call the
+        .getMolecule() method on the returned process to block until the
+        parameterisation is complete and get the parameterised molecule.
+    """
+
+    return _parameterise_gaff(
+        "gaff2",
+        molecule,
+        work_dir=work_dir,
         net_charge=net_charge,
         charge_method=charge_method,
         ensure_compatible=ensure_compatible,
         property_map=property_map,
     )
 
-    # Run the parameterisation protocol in the background and return
-    # a handle to the thread.
-    return _Process(molecule, protocol, work_dir=work_dir, auto_start=True)
-
 
-def gaff2(
+def _parameterise_gaff(
+    forcefield,
     molecule,
+    *,
     work_dir=None,
     net_charge=None,
     charge_method="BCC",
     ensure_compatible=True,
-    property_map={},
+    property_map=None,
     **kwargs,
 ):
     """
-    Parameterise using the GAFF2 force field.
+    Parameterise using the named GAFF force field.
 
     Parameters
     ----------
 
+    forcefield : str
+        The name of the GAFF force field, i.e. "gaff" or "gaff2".
+
     molecule : :class:`Molecule <BioSimSpace._SireWrappers.Molecule>`, str
         The molecule to parameterise, either as a Molecule object or SMILES
         string.
@@ -419,12 +573,18 @@ def gaff2(
         parameterisation is complete and get the parameterised molecule.
     """
 
-    if _amber_home is None:
-        raise _MissingSoftwareError(
-            "'BioSimSpace.Parameters.gaff2' is not supported. "
-            "Please install AmberTools (http://ambermd.org)."
+    if property_map is None:
+        property_map = {}
+
+    if forcefield not in _gaff_forcefields:
+        raise ValueError(
+            f"Unsupported GAFF forcefield '{forcefield}' "
+            f"options are {', '.join(_gaff_forcefields.keys())}."
         )
 
+    # Make sure the required software is available.
+    _check_software(forcefield)
+
     # Validate arguments.
     _validate(
         molecule=molecule,
@@ -434,28 +594,11 @@ def gaff2(
     )
 
     if net_charge is not None:
-        # Get the value of the charge.
-        if isinstance(net_charge, _Charge):
-            net_charge = net_charge.value()
-
-        if isinstance(net_charge, float):
-            if net_charge % 1 != 0:
-                raise ValueError("'net_charge' must be integer valued.")
-
-        # Try to convert to int.
-        try:
-            net_charge = int(net_charge)
-        except:
-            raise TypeError(
-                "'net_charge' must be of type 'int', or `BioSimSpace.Types.Charge'"
-            )
-
-        if net_charge % 1 != 0:
-            raise ValueError("'net_charge' must be integer valued.")
+        net_charge = _validate_net_charge(net_charge)
 
     # Create a default protocol.
     protocol = _Protocol.GAFF(
-        version=2,
+        version=_gaff_forcefields[forcefield],
         net_charge=net_charge,
         charge_method=charge_method,
         ensure_compatible=ensure_compatible,
@@ -473,7 +616,7 @@ def _parameterise_openff(
     ensure_compatible=True,
     use_nagl=True,
     work_dir=None,
-    property_map={},
+    property_map=None,
     **kwargs,
 ):
     """
@@ -592,11 +735,12 @@ def _parameterise_openff(
 
     if not isinstance(forcefield, str):
         raise TypeError("'forcefield' must be of type 'str'")
-    else:
-        # Strip whitespace and convert to lower case.
-        forcefield = forcefield.replace(" ", "").lower()
+    elif forcefield not in _forcefield_dict:
+        # Strip whitespace and convert to lower case. Intern the name so
+        # that the look-ups below can match keys by identity.
+        forcefield = _sys.intern(forcefield.translate(_ff_name_table).lower())
 
-        if forcefield not in _forcefields_lower:
+        if forcefield not in _forcefield_dict:
             raise ValueError("Supported force fields are: %s" % openForceFields())
 
     if not isinstance(ensure_compatible, bool):
@@ -605,7 +749,9 @@ def _parameterise_openff(
     if not isinstance(use_nagl, bool):
         raise TypeError("'use_nagl' must be of type 'bool'.")
 
-    if not isinstance(property_map, dict):
+    if property_map is None:
+        property_map = {}
+    elif not isinstance(property_map, dict):
         raise TypeError("'property_map' must be of type 'dict'")
 
     # Create a default protocol.
@@ -631,6 +777,7 @@ def forceFields():
     force_fields : [str]
         A list of the supported force fields.
     """
+    _discover_openff()
     return _forcefields
 
 
@@ -671,6 +818,7 @@ def openForceFields():
     force_fields : [str]
         A list of the supported force fields from the Open Force Field Initiative.
     """
+    _discover_openff()
     return _open_forcefields
 
 
@@ -824,6 +972,76 @@ def _has_ions(molecule, property_map={}):
         return False, ions
 
 
+def _check_software(forcefield, pdb2gmx=False):
+    """
+    Internal function to check that the software required to parameterise
+    using an AMBER force field is available.
+
+    Parameters
+    ----------
+
+    forcefield : str
+        The name of the force field.
+
+    pdb2gmx : bool
+        Whether the force field is supported by pdb2gmx, in which case
+        GROMACS can be used when AmberTools is unavailable.
+    """
+
+    if _has_amber or (pdb2gmx and _has_gromacs):
+        return
+
+    if pdb2gmx:
+        raise _MissingSoftwareError(
+            f"'BioSimSpace.Parameters.{forcefield}' is not supported. "
+            "Please install AmberTools (http://ambermd.org) or "
+            "GROMACS (http://www.gromacs.org)."
+        )
+    else:
+        raise _MissingSoftwareError(
+            f"'BioSimSpace.Parameters.{forcefield}' is not supported. "
+            "Please install AmberTools (http://ambermd.org)."
+        )
+
+
+def _validate_net_charge(net_charge):
+    """
+    Internal function to validate the net charge on a molecule.
+
+    Parameters
+    ----------
+
+    net_charge : int, :class:`Charge <BioSimSpace.Types.Charge>`
+        The net charge on the molecule.
+
+    Returns
+    -------
+
+    net_charge : int
+        The net charge as an integer.
+    """
+
+    # Get the value of the charge.
+    if isinstance(net_charge, _Charge):
+        net_charge = net_charge.value()
+
+    if isinstance(net_charge, float):
+        if not net_charge.is_integer():
+            raise ValueError("'net_charge' must be integer valued.")
+        return int(net_charge)
+
+    if isinstance(net_charge, int):
+        return int(net_charge)
+
+    # Try to convert to int, e.g. for NumPy integer types.
+    try:
+        return int(net_charge)
+    except:
+        raise TypeError(
+            "'net_charge' must be of type 'int', or `BioSimSpace.Types.Charge'"
+        )
+
+
 def _validate(
     molecule=None,
     tolerance=None,
@@ -998,9 +1216,19 @@ def _validate(
 # We could do this with functools.partial and functions.update_wrapper, but
 # this approach preserves correct documentation for the partial function,
 # both within the Python console, or via Sphinx.
+import functools as _functools
 import sys as _sys
+import threading as _threading
 
-_namespace = _sys.modules[__name__]
+_namespace = globals()
+
+# Translation table used to normalise user specified force field names, i.e.
+# remove any spaces.
+_ff_name_table = str.maketrans({" ": None})
+
+# Translation table used to create a sane function name from an Open Force
+# Field name, i.e. replace "-" and "." characters with "_".
+_func_name_table = str.maketrans({"-": "_", ".": "_"})
 
 
 def _make_amber_protein_function(name):
@@ -1014,7 +1242,7 @@ def _make_amber_protein_function(name):
         bonds=None,
         ensure_compatible=True,
         work_dir=None,
-        property_map={},
+        property_map=None,
     ):
         """
         Parameterise a molecule using the named AMBER force field.
@@ -1107,7 +1335,11 @@ def _make_amber_protein_function(name):
 # characters replaced by underscores.
 def _make_openff_function(name):
     def _function(
-        molecule, ensure_compatible=True, use_nagl=True, work_dir=None, property_map={}
+        molecule,
+        ensure_compatible=True,
+        use_nagl=True,
+        work_dir=None,
+        property_map=None,
     ):
         """
         Parameterise a molecule using the named force field from the
@@ -1167,8 +1399,8 @@ for _ff in _amber_protein_forcefields.keys():
     # Generate the function and bind it to the namespace.
     _function = _make_amber_protein_function(_ff)
     _function.__name__ = _ff
-    _function.__qualname = _ff
-    setattr(_namespace, _ff, _function)
+    _function.__qualname__ = _ff
+    _namespace[_ff] = _function
 
     # Expose the function to the user.
     __all__.append(_ff)
@@ -1180,75 +1412,170 @@ __all__.append("gaff2")
 # Create a list of the force field names (to date.)
 # This needs to come after all of the force field functions.
 _forcefields = []  # List of force fields (actual names).
-_forcefields_lower = []  # List of lower case names.
 _forcefield_dict = {}  # Mapping between lower case names and functions.
-for _ff in list(_amber_protein_forcefields.keys()) + ["gaff", "gaff2"]:
+# The look-up dispatches directly to the internal AMBER entry points, avoiding
+# the extra call through the user facing wrapper functions.
+for _ff in _amber_protein_forcefields.keys():
+    _forcefields.append(_ff)
+    _forcefield_dict[_sys.intern(_ff.lower())] = _functools.partial(
+        _parameterise_amber_protein, _ff
+    )
+for _ff in _gaff_forcefields.keys():
     _forcefields.append(_ff)
-    _forcefields_lower.append(_ff.lower())
-    _forcefield_dict[_ff.lower()] = getattr(_namespace, _ff)
-
-# Dynamically create functions for all available force fields from the Open
-# Force Field Initiative.
-_openforcefields = _try_import("openforcefields")
-
-if _have_imported(_openforcefields):
-    from glob import glob as _glob
-    import os as _os
-
-    _openff_dirs = _openforcefields.get_forcefield_dirs_paths()
-    _open_forcefields = []
-    # Loop over all force field directories.
-    for _dir in _openff_dirs:
-        # Glob all offxml files in the directory.
-        _ff_list = _glob(f"{_dir}" + "/*.offxml")
-        for _ff in _ff_list:
-            # Get the force field name (base name minus extension).
-            _base = _os.path.basename(_ff)
-            _ff = _os.path.splitext(_base)[0]
-
-            # Only include unconstrained force-fields since we need to go via
-            # an intermediate ParmEd conversion. This means ParmEd must receive
-            # bond parameters. We can then choose to constrain later, if required.
-            # See, e.g: https://github.com/openforcefield/openff-toolkit/issues/603
-
-            if "unconstrained" in _ff:
-                # Append to the list of available force fields.
-                _forcefields.append(_ff)
-                _open_forcefields.append(_ff)
-
-                # Create a sane function name, i.e. replace "-" and "."
-                # characters with "_".
-                _func_name = _ff.replace("-", "_")
-                _func_name = _func_name.replace(".", "_")
-
-                # Generate the function and bind it to the namespace.
-                _function = _make_openff_function(_ff)
-                _function.__name__ = _func_name
-                _function.__qualname = _func_name
-                setattr(_namespace, _func_name, _function)
-
-                # Expose the function to the user.
-                __all__.append(_func_name)
-
-                # Convert force field name to lower case and map to its function.
-                _forcefields_lower.append(_ff.lower())
-                _forcefield_dict[_ff.lower()] = getattr(_namespace, _func_name)
-
-    # Clean up redundant attributes.
-    del _base
-    del _dir
-    del _ff_list
-    del _func_name
-    del _glob
-    del _make_openff_function
-    del _openff_dirs
-    del _os
-elif _isVerbose():
-    print("openforcefields not available as this module cannot be loaded.")
+    _forcefield_dict[_sys.intern(_ff.lower())] = _functools.partial(
+        _parameterise_gaff, _ff
+    )
+
+# Functions for the force fields from the Open Force Field Initiative are
+# created on first use, since importing openforcefields is slow. This avoids
+# the cost for users who only need the AMBER force fields.
+_open_forcefields = []  # List of Open Force Field names.
+_is_openff_discovered = False
+_openff_lock = _threading.Lock()
+
+
+def _discover_openff():
+    """
+    Internal function to dynamically create functions for all available
+    force fields from the Open Force Field Initiative. This only does work
+    the first time that it is called.
+    """
+
+    global _is_openff_discovered
+
+    with _openff_lock:
+        if _is_openff_discovered:
+            return
+
+        openforcefields = _try_import("openforcefields")
+
+        if not _have_imported(openforcefields):
+            if _isVerbose():
+                print("openforcefields not available as this module cannot be loaded.")
+            _is_openff_discovered = True
+            return
+
+        # Find all unconstrained force fields in the force field directories.
+        open_forcefields = _find_openff_forcefields(
+            list(openforcefields.get_forcefield_dirs_paths())
+        )
+
+        # Generate the functions before registering any of them, so that
+        # nothing is left partially registered if discovery fails.
+        functions = {}
+        for ff in open_forcefields:
+            # Create a sane function name.
+            func_name = ff.translate(_func_name_table)
+
+            # Generate the function.
+            function = _make_openff_function(ff)
+            function.__name__ = func_name
+            function.__qualname__ = func_name
+            functions[ff] = function
+
+        namespace = globals()
+
+        # Append to the lists of available force fields.
+        _forcefields.extend(open_forcefields)
+        _open_forcefields.extend(open_forcefields)
+
+        for ff, function in functions.items():
+            # Bind the function to the namespace and expose it to the user.
+            namespace[function.__name__] = function
+            __all__.append(function.__name__)
+
+            # Convert force field name to lower case and map to its function.
+            _forcefield_dict[_sys.intern(ff.lower())] = function
+
+        # Only flag that discovery is complete once it has succeeded, so that
+        # it is retried after a failure.
+        _is_openff_discovered = True
+
+
+def _find_openff_forcefields(ff_dirs):
+    """
+    Internal function to find the names of the unconstrained force fields
+    from the Open Force Field Initiative in the given directories. If the
+    BSS_PARAM_CACHE environment variable is set, then the names are cached
+    and re-used until any of the directories are modified.
+
+    Parameters
+    ----------
+
+    ff_dirs : [str]
+        The force field directories.
+
+    Returns
+    -------
+
+    forcefields : [str]
+        The names of the force fields.
+    """
+
+    import hashlib as _hashlib
+    import json as _json
+
+    cache_dir = _get_cache_dir()
+
+    # Check the cache. The modification time of each directory changes when
+    # force field files are added or removed.
+    if cache_dir is not None:
+        key = _hashlib.sha1(repr(ff_dirs).encode()).hexdigest()
+        cache_file = _os.path.join(cache_dir, f"openff_{key}.json")
+        try:
+            mtimes = [_os.stat(ff_dir).st_mtime_ns for ff_dir in ff_dirs]
+        except OSError:
+            mtimes = None
+        try:
+            with open(cache_file, "r") as f:
+                cached = _json.load(f)
+            if mtimes is not None and cached["mtimes"] == mtimes:
+                return cached["forcefields"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    # Only include unconstrained force-fields since we need to go via
+    # an intermediate ParmEd conversion. This means ParmEd must receive
+    # bond parameters. We can then choose to constrain later, if required.
+    # See, e.g: https://github.com/openforcefield/openff-toolkit/issues/603
+    forcefields = []
+    for ff_dir in ff_dirs:
+        with _os.scandir(ff_dir) as entries:
+            forcefields.extend(
+                entry.name[: -len(".offxml")]
+                for entry in entries
+                if entry.name.endswith(".offxml") and "unconstrained" in entry.name
+            )
+
+    # Update the cache.
+    if cache_dir is not None and mtimes is not None:
+        try:
+            _os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{_os.getpid()}"
+            with open(tmp_file, "w") as f:
+                _json.dump({"mtimes": mtimes, "forcefields": forcefields}, f)
+            _os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
+    return forcefields
+
+
+def __getattr__(name):
+    """
+    Return the named Open Force Field function, discovering the available
+    force fields if needed.
+    """
+
+    if not name.startswith("_"):
+        _discover_openff()
+        if name in globals():
+            return globals()[name]
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Clean up redundant attributes.
 del _ff
 del _function
 del _namespace
-del _openforcefields
-del _sys
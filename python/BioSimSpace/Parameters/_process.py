@@ -51,6 +51,8 @@ import threading as _threading
 import warnings as _warnings
 import zipfile as _zipfile
 
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+
 from .. import _is_notebook
 from .. import _isVerbose
 from .._Exceptions import ParameterisationError as _ParameterisationError
@@ -62,6 +64,85 @@ from . import _Protocol
 if _is_notebook:
     from IPython.display import FileLink as _FileLink
 
+# A shared pool of worker threads used to run parameterisation protocols.
+# This is created on first use and re-used by all processes. By default it
+# has one worker per CPU, with additional processes queued until a worker
+# is free. The pool is only enlarged when more workers are reserved.
+_pool = None
+_pool_size = 0
+_pool_lock = _threading.Lock()
+
+
+def _reserve_workers(max_workers):
+    """
+    Internal function to make sure that the shared pool of worker threads
+    used to run parameterisation protocols has at least the given number of
+    workers, creating the pool if needed.
+
+    Parameters
+    ----------
+
+    max_workers : int
+        The minimum number of workers required. If this is larger than the
+        size of the current pool, then it is replaced by a larger one. Any
+        protocols already submitted to the old pool continue to run. A new
+        pool always has at least one worker per CPU.
+    """
+
+    global _pool, _pool_size
+
+    with _pool_lock:
+        if _pool is None:
+            max_workers = max(max_workers, _os.cpu_count() or 1)
+        elif max_workers > _pool_size:
+            # Stop the old pool accepting new work. Its threads exit once the
+            # protocols that have already been submitted are complete.
+            _pool.shutdown(wait=False)
+        else:
+            return
+
+        _pool = _ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="BioSimSpace.Parameters",
+        )
+        _pool_size = max_workers
+
+
+def _submit(function, *args):
+    """
+    Internal function to submit a function to the shared pool of worker
+    threads used to run parameterisation protocols.
+
+    Parameters
+    ----------
+
+    function : function
+        The function to run.
+
+    args : tuple
+        The arguments to the function.
+
+    Returns
+    -------
+
+    future : concurrent.futures.Future
+        A future for the result of the function.
+    """
+
+    global _pool, _pool_size
+
+    # Submit while holding the lock so that the pool can't be replaced
+    # in the meantime. Create a pool of the default size if there isn't
+    # one, otherwise use the existing pool, whatever its size.
+    with _pool_lock:
+        if _pool is None:
+            _pool_size = _os.cpu_count() or 1
+            _pool = _ThreadPoolExecutor(
+                max_workers=_pool_size,
+                thread_name_prefix="BioSimSpace.Parameters",
+            )
+        return _pool.submit(function, *args)
+
 
 def _wrap_protocol(protocol_function, process):
     """
@@ -93,7 +174,12 @@ def _wrap_protocol(protocol_function, process):
 
 
 class Process:
-    """A class for running parameterisation protocols as a background process."""
+    """
+    A class for running parameterisation protocols as a background process.
+    Processes are run by a shared pool of worker threads, which has one
+    worker per CPU by default. When more processes are started, they are
+    queued until a worker is available.
+    """
 
     def __init__(self, molecule, protocol, work_dir=None, auto_start=False):
         """
@@ -167,9 +253,9 @@ class Process:
         self._is_started = False
         self._is_finished = False
 
-        # Initialise the queue and thread.
+        # Initialise the queue and the future for the running protocol.
         self._queue = None
-        self._thread = None
+        self._future = None
 
         # Start the process.
         if auto_start:
@@ -187,13 +273,8 @@ class Process:
         # Create the queue.
         self._queue = _queue.Queue()
 
-        # Create the thread.
-        self._thread = _threading.Thread(
-            target=_wrap_protocol, args=[self._protocol.run, self]
-        )
-
-        # Start the thread.
-        self._thread.start()
+        # Submit the protocol to the shared thread pool.
+        self._future = _submit(_wrap_protocol, self._protocol.run, self)
 
     def getMolecule(self):
         """
@@ -209,11 +290,11 @@ class Process:
 
         # Start the process, if it's not already started.
         if not self._is_started:
-            self._start()
+            self.start()
 
         # Block the thread until it finishes.
         if not self._is_finished:
-            self._thread.join()
+            self._future.result()
 
             # Get the parameterise molecule from the thread function.
             self._new_molecule = self._queue.get()
@@ -26,11 +26,11 @@ __email__ = "lester.hedges@gmail.com"
 
 __all__ = ["formalCharge"]
 
+import os as _os
 import tempfile as _tempfile
 
 from .. import _is_notebook
 from .. import IO as _IO
-from .. import _Utils
 from ..Units.Charge import electron_charge as _electron_charge
 from .._SireWrappers import Molecule as _Molecule
 
@@ -71,15 +71,15 @@ def formalCharge(molecule):
     # Zero the total formal charge.
     formal_charge = 0
 
-    # Run in the working directory.
-    with _Utils.cd(work_dir):
-        # Save the molecule to a PDB file.
-        _IO.saveMolecules("tmp", molecule, "PDB")
+    # Save the molecule to a PDB file in the working directory. Absolute
+    # paths are used, rather than changing directory, since the current
+    # working directory is shared by all threads.
+    _IO.saveMolecules(_os.path.join(work_dir, "tmp"), molecule, "PDB")
 
-        # Read the ligand PDB into an RDKit molecule.
-        mol = _Chem.MolFromPDBFile("tmp.pdb")
+    # Read the ligand PDB into an RDKit molecule.
+    mol = _Chem.MolFromPDBFile(_os.path.join(work_dir, "tmp.pdb"))
 
-        # Compute the formal charge.
-        formal_charge = _Chem.rdmolops.GetFormalCharge(mol)
+    # Compute the formal charge.
+    formal_charge = _Chem.rdmolops.GetFormalCharge(mol)
 
     return formal_charge * _electron_charge
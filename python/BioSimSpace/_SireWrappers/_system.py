@@ -468,6 +468,15 @@ class System(_SireWrapper):
         if self._mol_nums != other._mol_nums:
             return False
 
+        # The systems have the same UID and version, so are in the same state,
+        # e.g. when one is an unmodified copy of the other. There is no need
+        # to compare the molecules, as long as properties are mapped the same.
+        if (
+            property_map0 == property_map1
+            and self._sire_object.version() == other._sire_object.version()
+        ):
+            return True
+
         # Invert the property maps.
         inv_prop_map0 = {v: k for k, v in property_map0.items()}
         inv_prop_map1 = {v: k for k, v in property_map1.items()}
@@ -1,3 +1,4 @@
+import math
 import pytest
 import sys
 
@@ -74,6 +75,55 @@ def test_invalid_prematch(system0, system1, prematch):
         )
 
 
+def test_match_cache(system0, system1, monkeypatch):
+    # Extract the molecules.
+    m0 = system0.getMolecules()[0]
+    m1 = system1.getMolecules()[0]
+
+    # Get the best mapping between the molecules.
+    mapping0 = BSS.Align.matchAtoms(m0, m1, timeout=BSS.Units.Time.second)
+
+    # Modify the mapping, which shouldn't affect the cached result.
+    mapping1 = mapping0.copy()
+    mapping0.clear()
+
+    # Make sure the match isn't computed again.
+    def _matchAtoms(*args, **kwargs):
+        raise AssertionError("The cached result wasn't used.")
+
+    monkeypatch.setattr(BSS.Align._align, "_matchAtoms", _matchAtoms)
+
+    # Make sure the cached result is returned.
+    assert BSS.Align.matchAtoms(m0, m1, timeout=BSS.Units.Time.second) == mapping1
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_match_batch(system0, system1, n_workers):
+    # Extract the molecules.
+    m0 = system0.getMolecules()[0]
+    m1 = system1.getMolecules()[0]
+
+    # Get the best mappings between the molecules in serial.
+    mapping0 = BSS.Align.matchAtoms(
+        m0, m1, timeout=BSS.Units.Time.second, use_cache=False
+    )
+    mapping1 = BSS.Align.matchAtoms(
+        m1, m0, timeout=BSS.Units.Time.second, use_cache=False
+    )
+
+    # Match the pairs as a batch. With multiple workers the molecules and
+    # keyword arguments must be sent to separate processes.
+    mappings = BSS.Align.matchAtomsBatch(
+        [(m0, m1), (m1, m0)],
+        n_workers=n_workers,
+        timeout=BSS.Units.Time.second,
+        use_cache=False,
+    )
+
+    # Make sure the results are consistent.
+    assert mappings == [mapping0, mapping1]
+
+
 def test_merge():
     # Load the ligands.
     s0 = BSS.IO.readMolecules([f"{url}/ligand31.prm7.bz2", f"{url}/ligand31.rst7.bz2"])
@@ -695,3 +745,56 @@ def test_ion_merge(system):
     water_coords = water._sire_object.property("coordinates").toVector()[0]
     assert coords0 == coords1
     assert coords0 == water_coords
+
+
+@pytest.mark.parametrize("matches", [1, 2, 5, 20])
+def test_rank_mappings(matches):
+    # Create a set of dummy mappings and mean squared displacement scores,
+    # including a tie.
+    scores = [5.0, 3.0, 9.0, 1.0, 7.0, 3.0, 8.0, 2.0, 6.0, 4.0, 0.5, 11.0]
+    mappings = [{x: x} for x in range(len(scores))]
+
+    # Rank the mappings.
+    ranked_mappings, ranked_scores = BSS.Align._align._rank_mappings(
+        [BSS.Align._align._mapping_to_arrays(x) for x in mappings], scores, matches
+    )
+
+    # Make sure the ranking matches a full stable sort.
+    keys = sorted(range(len(scores)), key=lambda k: scores[k])[:matches]
+    assert ranked_mappings == [mappings[x] for x in keys]
+    assert ranked_scores == [scores[x] for x in keys]
+
+    # Make sure the scores are converted to RMSD values.
+    rmsd_scores = BSS.Align._align._to_rmsd_scores(ranked_scores)
+    assert [x.value() for x in rmsd_scores] == pytest.approx(
+        [math.sqrt(scores[x]) for x in keys]
+    )
+
+
+@pytest.mark.parametrize("num_atoms", [2, 3, 10])
+def test_aligned_msd(num_atoms):
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+
+    # Create a random set of coordinates.
+    coords0 = 3.0 * rng.normal(size=(num_atoms, 3))
+
+    # Apply a random rotation and translation, then add some noise.
+    rotation, _ = np.linalg.qr(rng.normal(size=(3, 3)))
+    if np.linalg.det(rotation) < 0:
+        rotation[:, 0] *= -1
+    coords1 = coords0 @ rotation + 5.0 + 0.1 * rng.normal(size=(num_atoms, 3))
+
+    idx = np.arange(num_atoms)
+    msd = BSS.Align._align._compute_aligned_msd(coords0, coords1, idx, idx)
+
+    # Compute the reference MSD using the Kabsch algorithm.
+    c0 = coords0 - coords0.mean(axis=0)
+    c1 = coords1 - coords1.mean(axis=0)
+    u, _, vt = np.linalg.svd(c0.T @ c1)
+    d = np.sign(np.linalg.det(u @ vt))
+    r = u @ np.diag([1.0, 1.0, d]) @ vt
+    ref = ((c0 @ r - c1) ** 2).sum(axis=1).mean()
+
+    assert msd == pytest.approx(ref, abs=1e-10)
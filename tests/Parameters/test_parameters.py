@@ -1,3 +1,4 @@
+import os
 import pytest
 import tempfile
 
@@ -167,3 +168,152 @@ def test_smiles_stereo():
 
     # Make sure the SMILES strings are the same.
     assert rdmol0_smiles == rdmol1_smiles
+
+
+@pytest.mark.parametrize("kwargs", [{"net_charge": 1}, {"water_mdoel": "tip3p"}])
+def test_parameterise_unknown_kwarg(kwargs):
+    """
+    Test that unsupported keyword arguments are rejected by parameterise for
+    AMBER protein force fields, as they are by the named functions.
+    """
+
+    with pytest.raises(TypeError):
+        BSS.Parameters.parameterise("C", "ff14SB", **kwargs)
+
+
+@pytest.mark.skipif(
+    has_antechamber is False or has_tleap is False,
+    reason="Requires AmberTools/antechamber and tLEaP to be installed.",
+)
+def test_parameterise_many():
+    """Test that batch parameterisation preserves the order of the input."""
+
+    # Define the SMILES strings.
+    smiles = ["C", "CC", "CCC"]
+
+    # Parameterise the molecules.
+    mols = BSS.Parameters.parameteriseMany(smiles, "gaff", max_workers=2)
+
+    # Make sure the molecules are returned in order.
+    assert [mol.nAtoms() for mol in mols] == [5, 8, 11]
+
+
+@pytest.mark.skipif(
+    has_antechamber is False or has_tleap is False,
+    reason="Requires AmberTools/antechamber and tLEaP to be installed.",
+)
+def test_parameterise_many_charged():
+    """
+    Test concurrent parameterisation of charged molecules, where the net
+    charge is computed from the formal charge on each molecule.
+    """
+
+    # Define the SMILES strings and the expected net charges.
+    smiles = ["CC(=O)[O-]", "C[NH3+]", "OC(=O)C[O-]", "CC[NH3+]"]
+    charges = [-1, 1, -1, 1]
+
+    # Parameterise the molecules concurrently.
+    mols = BSS.Parameters.parameteriseMany(smiles, "gaff", max_workers=4)
+
+    # Make sure each molecule has the correct net charge.
+    assert [round(mol.charge().value()) for mol in mols] == charges
+
+
+@pytest.mark.skipif(
+    has_antechamber is False or has_tleap is False,
+    reason="Requires AmberTools/antechamber and tLEaP to be installed.",
+)
+def test_gaff_cache(monkeypatch, tmp_path):
+    """Test that GAFF parameterisation output is re-used from the cache."""
+
+    monkeypatch.setattr(BSS.Parameters._cache, "_cache_dir", str(tmp_path))
+
+    # Parameterise the same molecule twice.
+    mol = BSS.IO.readMolecules(
+        [f"{url}/ligand31.prm7.bz2", f"{url}/ligand31.rst7.bz2"]
+    ).getMolecules()[0]
+    mol0 = BSS.Parameters.gaff(mol, net_charge=0).getMolecule()
+
+    # Make sure a single cache entry was created.
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # Make sure antechamber and tLEaP aren't run for the second molecule.
+    def run_antechamber(self, command, ff, work_dir):
+        raise AssertionError("The cached output wasn't used.")
+
+    monkeypatch.setattr(
+        BSS.Parameters._Protocol.GAFF, "_run_antechamber", run_antechamber
+    )
+    mol1 = BSS.Parameters.gaff(mol, net_charge=0).getMolecule()
+
+    # Make sure the charges are the same.
+    charge0 = [atom.charge().value() for atom in mol0.getAtoms()]
+    charge1 = [atom.charge().value() for atom in mol1.getAtoms()]
+    assert charge0 == charge1
+
+
+@pytest.mark.skipif(has_openff is False, reason="Requires OpenFF to be installed.")
+def test_openff_functions():
+    """Test that functions are created for the Open Force Field force fields."""
+
+    for ff in BSS.Parameters.openForceFields():
+        func_name = ff.replace("-", "_").replace(".", "_")
+        assert callable(getattr(BSS.Parameters, func_name))
+        assert ff in BSS.Parameters.forceFields()
+
+
+def test_openff_discovery_cache(monkeypatch, tmp_path):
+    """Test that the Open Force Field discovery results are cached."""
+
+    from BioSimSpace.Parameters._parameters import _find_openff_forcefields
+
+    cache_dir = tmp_path / "cache"
+    ff_dir = tmp_path / "forcefields"
+    ff_dir.mkdir()
+    (ff_dir / "test-1.0.0.offxml").touch()
+    (ff_dir / "test_unconstrained-1.0.0.offxml").touch()
+
+    monkeypatch.setattr(BSS.Parameters._cache, "_cache_dir", str(cache_dir))
+
+    # Only unconstrained force fields should be found.
+    assert _find_openff_forcefields([str(ff_dir)]) == ["test_unconstrained-1.0.0"]
+
+    # Make sure a cache file was created.
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # Make sure the cached names are re-used without scanning the directory.
+    def scandir(path):
+        raise AssertionError("The force field directory was scanned.")
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    assert _find_openff_forcefields([str(ff_dir)]) == ["test_unconstrained-1.0.0"]
+
+    # Make sure the directory is scanned again once it has been modified.
+    monkeypatch.undo()
+    monkeypatch.setattr(BSS.Parameters._cache, "_cache_dir", str(cache_dir))
+    (ff_dir / "test2_unconstrained-1.0.0.offxml").touch()
+    os.utime(ff_dir, ns=(0, 0))
+    assert sorted(_find_openff_forcefields([str(ff_dir)])) == [
+        "test2_unconstrained-1.0.0",
+        "test_unconstrained-1.0.0",
+    ]
+
+
+@pytest.mark.skipif(has_openff is False, reason="Requires OpenFF to be installed.")
+def test_openff_discovery_retry(monkeypatch):
+    """Test that Open Force Field discovery is retried after a failure."""
+
+    from BioSimSpace.Parameters import _parameters
+
+    def find_openff_forcefields(ff_dirs):
+        raise OSError("Unable to read the force field directories.")
+
+    monkeypatch.setattr(_parameters, "_is_openff_discovered", False)
+    monkeypatch.setattr(
+        _parameters, "_find_openff_forcefields", find_openff_forcefields
+    )
+
+    # Make sure the failure is raised and discovery isn't flagged as complete.
+    with pytest.raises(OSError):
+        _parameters._discover_openff()
+    assert _parameters._is_openff_discovered is False